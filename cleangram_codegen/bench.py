@@ -0,0 +1,559 @@
+import copy
+import gc
+import http.client
+import http.server
+import json
+import os
+import pathlib
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from . import cache
+from .enums import BackendType, LayoutType, ModelType, PackageType
+from .generator import Generator
+from .importer import mount
+from .models import Api, Argument, Component
+from .parser import (
+    HAS_LXML, get_content, get_html, parse_api, parse_headers, process_input_media,
+)
+from .sinks import DirSink, MemorySink
+from .templates import BotTemplate
+
+
+def timeit(func: Callable[[], object], repeat: int = 3) -> float:
+    """
+    Best wall time of **func** in seconds
+
+    :param func:
+    :param repeat:
+    :return:
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def grow(html: str, factor: int) -> str:
+    """
+    Repeat every section of recorded page **factor** times
+
+    Emulates Bot API page which keeps growing.
+
+    :param html:
+    :param factor:
+    :return:
+    """
+    content = get_content(html)
+    start = next(h3 for h3 in content.find_all("h3") if h3.text == "Getting updates")
+    sections = [start, *start.next_siblings]
+    for _ in range(factor - 1):
+        for tag in sections:
+            content.append(copy.copy(tag))
+    return str(content)
+
+
+def bench_parse(html: str, factors: List[int], repeat: int = 3) -> List[Dict[str, float]]:
+    """
+    Time :func:`parse_headers` on page grown by each of **factors**
+
+    :param html:
+    :param factors:
+    :param repeat:
+    :return:
+    """
+    results = []
+    for factor in factors:
+        content = get_content(grow(html, factor))
+        components = sum(len(h.components) for h in parse_headers(content))
+        seconds = timeit(lambda: parse_headers(content), repeat)
+        results.append({
+            "factor": factor,
+            "components": components,
+            "seconds": seconds,
+            "per_component": seconds / components,
+        })
+    return results
+
+
+def dump(html: str, backend: BackendType) -> Dict[str, Any]:
+    content = get_content(html, backend)
+    api = parse_api(content)
+    process_input_media(api)
+    return cache.dump(api)
+
+
+def bench_backends(html: str, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Time :func:`get_content` with every backend
+
+    Serialized :class:`Api` of each backend is compared to ``html.parser`` one.
+
+    :param html:
+    :param repeat:
+    :return:
+    """
+    reference = dump(html, BackendType.HTML_PARSER)
+    results = []
+    for backend in BackendType:
+        if backend == BackendType.LXML and not HAS_LXML:
+            continue
+        results.append({
+            "backend": backend.value,
+            "seconds": timeit(lambda: get_content(html, backend), repeat),
+            "identical": dump(html, backend) == reference,
+        })
+    return results
+
+
+def bench_render(api: Api, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Time rendering of :class:`BotTemplate` for every package
+
+    :param api:
+    :param repeat:
+    :return:
+    """
+    return [
+        {
+            "package": pt.value,
+            "seconds": timeit(lambda: str(BotTemplate(api=api, package=pt)), repeat),
+        }
+        for pt in PackageType
+    ]
+
+
+def run_phases(spec_file: pathlib.Path, root: pathlib.Path) -> Tuple[Dict[str, float], Api]:
+    """
+    Run the whole pipeline on **spec_file** once, writing into **root**
+
+    :param spec_file:
+    :param root: empty directory
+    :return: seconds of every phase, rendering is timed by template class
+    """
+    timings: Dict[str, float] = {}
+
+    def timed(phase: str, func: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = func()
+        timings[phase] = time.perf_counter() - start
+        return result
+
+    html = timed("read", lambda: get_html(spec_file))
+    content = timed("get_content", lambda: get_content(html))
+    api = timed("parse_headers", lambda: parse_api(content))
+    timed("process_input_media", lambda: process_input_media(api))
+    timed("finalize", api.finalize)
+    gen = Generator(cache_dir=None, jobs=1, incremental=False, sink=DirSink(root), api=api)
+    gen.run()
+    timings.update(gen.timings)
+    return timings, api
+
+
+def bench_phases(spec_files: Iterable[pathlib.Path], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time every phase of the pipeline on each of **spec_files**
+
+    Formatting runs in a single process without cache,
+    so every phase is measured on its own.
+
+    :param spec_files: recorded snapshots of Bot API page
+    :param repeat: best time of every phase is kept
+    :return: JSON-serializable report
+    """
+    fixtures = []
+    for spec_file in spec_files:
+        best: Dict[str, float] = {}
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as root:
+                timings, api = run_phases(spec_file, pathlib.Path(root))
+            for phase, seconds in timings.items():
+                best[phase] = min(seconds, best.get(phase, seconds))
+        fixtures.append({
+            "spec_file": spec_file.name,
+            "version": api.version,
+            "size": spec_file.stat().st_size,
+            "components": len(api.by_name),
+            "phases": best,
+            "total": sum(best.values()),
+        })
+    return {
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "fixtures": fixtures,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Ratio of new to old seconds of every phase present in both reports
+
+    :param old: report of :func:`bench_phases`
+    :param new: report of :func:`bench_phases`
+    :return:
+    """
+    old_fixtures = {f["spec_file"]: f for f in old["fixtures"]}
+    results = []
+    for fixture in new["fixtures"]:
+        if not (prev := old_fixtures.get(fixture["spec_file"])):
+            continue
+        before = {**prev["phases"], "total": prev["total"]}
+        for phase, seconds in {**fixture["phases"], "total": fixture["total"]}.items():
+            if not before.get(phase):
+                continue
+            results.append({
+                "spec_file": fixture["spec_file"],
+                "phase": phase,
+                "old": before[phase],
+                "new": seconds,
+                "ratio": seconds / before[phase],
+            })
+    return results
+
+
+SAMPLE_VALUES = {"int": 1, "str": "x", "float": 1.0, "bool": True}
+
+
+def sample_value(arg: Argument, depth: int) -> Any:
+    if arg.default:
+        return arg.default
+    if arg.com_types and arg.com_types[0].is_object:
+        value = sample(arg.com_types[0], depth - 1)
+        if value is None:
+            return None
+    else:
+        value = SAMPLE_VALUES.get(arg.std_types[0] if arg.std_types else "str", "x")
+    for _ in range(arg.array):
+        value = [value]
+    return value
+
+
+def sample(com: Component, depth: int = 2) -> Optional[Dict[str, Any]]:
+    """
+    Payload of object **com** with every field filled,
+    optional nested objects are omitted below **depth**
+
+    :param com:
+    :param depth:
+    :return: ``None`` if required nested objects are below **depth**
+    """
+    payload = {}
+    for arg in com.args:
+        if arg.optional and depth <= 0 and arg.com_types:
+            continue
+        value = sample_value(arg, depth)
+        if value is None:
+            if not arg.optional:
+                return None
+            continue
+        payload[arg.name] = value
+    return payload
+
+
+def sample_updates(api: Api, size: int = 100) -> List[Dict[str, Any]]:
+    """
+    Updates with the same sampled message and increasing ``update_id``
+    """
+    message = sample(api.by_name["Message"], depth=2)
+    return [{"update_id": i, "message": message} for i in range(size)]
+
+
+def held(func: Callable[[], object]) -> int:
+    """
+    Bytes still allocated by result of **func**
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def bench_models(
+        api: Api, base: pathlib.Path, updates: List[Dict[str, Any]], repeat: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Decode batch of **updates** into ``aio`` objects of every model backend
+
+    Package of each backend is rendered into memory and imported
+    along with hand-written part of it from **base**.
+    Every backend decodes with validating ``Update.parse_obj``
+    and with generated ``update_from_dict`` from parsed dicts and from raw JSON.
+
+    :param api:
+    :param base: directory with hand-written part of package
+    :param updates: payloads of ``Update``
+    :param repeat:
+    :return: seconds of the batch and memory held by decoded batch
+    """
+    raw = [json.dumps(u).encode("utf-8") for u in updates]
+    results = []
+    for model in ModelType:
+        sink = MemorySink()
+        Generator(
+            cache_dir=None, jobs=1, incremental=False, sink=sink, api=api, model=model,
+        ).run()
+        with mount(sink, base) as finder:
+            update = finder.import_module("cleangram.aio.objects").Update
+            from_dict = finder.import_module("cleangram.aio.objects.decoders").update_from_dict
+            for path, decode, batch in (
+                    ("parse_obj", update.parse_obj, updates),
+                    ("from_dict", from_dict, updates),
+                    ("from_dict(bytes)", from_dict, raw),
+            ):
+                decode(batch[0])
+                seconds = timeit(lambda: [decode(u) for u in batch], repeat)
+                allocated = held(lambda: [decode(u) for u in batch])
+                results.append({
+                    "model": model.value,
+                    "path": path,
+                    "updates": len(batch),
+                    "seconds": seconds,
+                    "per_update": seconds / len(batch),
+                    "bytes": allocated,
+                    "per_update_bytes": allocated / len(batch),
+                })
+    return results
+
+
+def rss() -> int:
+    """
+    Resident memory of this process in bytes, Linux only
+    """
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@contextmanager
+def peak_rss(interval: float = 0.002) -> Iterator[Dict[str, int]]:
+    """
+    Highest resident memory over the usage before the block, sampled every **interval**
+    """
+    result = {"peak": 0}
+    before = rss()
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            result["peak"] = max(result["peak"], rss() - before)
+            stop.wait(interval)
+
+    thread = threading.Thread(target=sample, daemon=True)
+    thread.start()
+    try:
+        yield result
+    finally:
+        stop.set()
+        thread.join()
+        result["peak"] = max(result["peak"], rss() - before)
+
+
+IMPORT_PROBE = """
+import os
+import sys
+
+import pydantic
+
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+before = rss()
+import {module}
+print(rss() - before, sum(name.startswith("cleangram.") for name in sys.modules))
+"""
+IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", re.MULTILINE)
+
+
+def import_profile(root: pathlib.Path, module: str) -> Dict[str, Any]:
+    """
+    Import **module** of package under **root** in fresh interpreter run with ``-X importtime``
+
+    Pydantic is imported beforehand, so only the package is accounted.
+    Linux only, like :func:`rss`.
+
+    :param root: directory with ``cleangram`` package
+    :param module: dotted name of imported module
+    :return: microseconds of import, modules of package loaded
+        and growth of resident memory in bytes
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(root), *filter(None, sys.path)]))
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_PROBE.format(module=module)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    us = {name: int(cumulative) for cumulative, name in IMPORT_TIME.findall(done.stderr)}
+    memory, modules = map(int, done.stdout.split())
+    return {"us": us[module], "modules": modules, "rss": memory}
+
+
+def install(sink: MemorySink, base: pathlib.Path, root: pathlib.Path):
+    """
+    Write package rendered into **sink** under **root**, over hand-written part of it from **base**
+    """
+    shutil.copytree(base / "cleangram", root / "cleangram")
+    for path, txt in sink.files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(txt, encoding="utf-8")
+
+
+def bench_imports(
+        api: Api,
+        base: pathlib.Path,
+        modules: Iterable[str] = ("cleangram.aio.objects", "cleangram.aio.paths"),
+        repeat: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Import **modules** of package in split, lazy split and bundled layouts
+
+    Package of each layout is written along with hand-written part of it from **base**
+    into temporary directory and every module is imported in fresh interpreter.
+
+    :param api:
+    :param base: directory with hand-written part of package
+    :param modules:
+    :param repeat:
+    :return: best import time, modules of package loaded and growth of resident memory
+    """
+    results = []
+    for layout, options in (
+            ("split", {}),
+            ("split lazy", dict(lazy_init=True)),
+            ("bundled", dict(layout=LayoutType.BUNDLED)),
+    ):
+        sink = MemorySink()
+        Generator(
+            cache_dir=None, jobs=1, incremental=False, sink=sink, api=api, **options,
+        ).run()
+        with tempfile.TemporaryDirectory() as tmp:
+            root = pathlib.Path(tmp)
+            install(sink, base, root)
+            for module in modules:
+                profiles = [import_profile(root, module) for _ in range(repeat)]
+                best = min(profiles, key=lambda p: p["us"])
+                results.append({
+                    "layout": layout,
+                    "module": module,
+                    "seconds": best["us"] / 1e6,
+                    "modules": best["modules"],
+                    "rss": min(p["rss"] for p in profiles),
+                })
+    return results
+
+
+class DiscardHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Read request body in chunks and drop it, like an upload endpoint,
+    answering :attr:`reply` with :attr:`status`
+    """
+    reply = b"{}"
+    status = 200
+    content_type = "application/json"
+
+    def do_POST(self):
+        left = int(self.headers["Content-Length"])
+        while left:
+            left -= len(self.rfile.read(min(left, 64 * 1024)))
+        self.answer()
+
+    def answer(self):
+        self.send_response(self.status)
+        self.send_header("Content-Type", self.content_type)
+        self.send_header("Content-Length", str(len(self.reply)))
+        self.end_headers()
+        self.wfile.write(self.reply)
+
+    def log_message(self, *args): ...
+
+
+@contextmanager
+def http_stub(
+        handler: Type[http.server.BaseHTTPRequestHandler] = DiscardHandler,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Local HTTP server discarding uploads, its address
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_upload(
+        api: Api, base: pathlib.Path, files: int = 10, size: int = 16 * 2 ** 20,
+) -> List[Dict[str, Any]]:
+    """
+    Upload album of **files** to local HTTP stub, each of **size** bytes
+
+    Streamed body of generated ``Multipart`` is compared to body of files read whole.
+
+    :param api:
+    :param base: directory with hand-written part of package
+    :param files:
+    :param size:
+    :return: seconds and peak resident memory of every way
+    """
+    sink = MemorySink()
+    Generator(cache_dir=None, jobs=1, incremental=False, sink=sink, api=api).run()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, http_stub() as address, \
+            mount(sink, base) as finder:
+        multipart = finder.import_module("cleangram.core.paths.multipart")
+        paths = []
+        for n in range(files):
+            paths.append(pathlib.Path(tmp) / f"video{n}.mp4")
+            with open(paths[-1], "wb") as f:
+                for _ in range(size // 2 ** 20):
+                    f.write(os.urandom(2 ** 20))
+
+        def streamed() -> Tuple[Any, Dict[str, str]]:
+            body = multipart.Multipart(
+                {
+                    "chat_id": 1,
+                    "media": [{"type": "video", "media": f"attach://{p.stem}"} for p in paths],
+                },
+                {p.stem: multipart.FilePart(p) for p in paths},
+            )
+            return body, body.headers
+
+        def whole() -> Tuple[Any, Dict[str, str]]:
+            body = b"".join(p.read_bytes() for p in paths)
+            return body, {"Content-Length": str(len(body))}
+
+        for way, make in (("stream", streamed), ("read", whole)):
+            gc.collect()
+            conn = http.client.HTTPConnection(*address)
+            start = time.perf_counter()
+            with peak_rss() as memory:
+                body, headers = make()
+                conn.request("POST", "/sendMediaGroup", body=body, headers=headers)
+                conn.getresponse().read()
+                del body
+            results.append({
+                "way": way,
+                "files": files,
+                "bytes": files * size,
+                "seconds": time.perf_counter() - start,
+                "peak_rss": memory["peak"],
+            })
+            conn.close()
+    return results
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import pathlib
+from typing import Any, Dict, Optional
+
+from . import comps
+from .enums import BackendType
+from .models import Api, Argument, Component, Header
+
+CACHE_DIR = pathlib.Path.home() / ".cache" / "cleangram_codegen"
+
+# Bump on every change of parser or models that affects the parsed graph
+FORMAT_VERSION = 3
+
+FORMAT_CACHE_SIZE = 64 * 2 ** 20
+
+
+def key(html: str, backend: BackendType = BackendType.AUTO) -> str:
+    """
+    Content address of Bot API page parsed with **backend**
+
+    :param html:
+    :param backend: HTML tree builder
+    :return:
+    """
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{backend.value}:".encode())
+    digest.update(html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def dump_argument(arg: Argument) -> Dict[str, Any]:
+    return {
+        "name": arg.name,
+        "desc": arg.desc,
+        "array": arg.array,
+        "optional": arg.optional,
+        "default": arg.default,
+        "std_types": arg.std_types,
+        "com_types": [t.name for t in arg.com_types],
+    }
+
+
+def dump_component(com: Component) -> Dict[str, Any]:
+    return {
+        "name": com.name,
+        "anchor": com.anchor,
+        "parent": com.parent.name,
+        "desc": com.desc,
+        "subclasses": [sub.name for sub in com.subclasses],
+        "args": [dump_argument(a) for a in com.args],
+        "result": dump_argument(com.result),
+    }
+
+
+def dump(api: Api) -> Dict[str, Any]:
+    return {
+        "version": api.version,
+        "headers": [
+            {
+                "name": h.name,
+                "anchor": h.anchor,
+                "components": [dump_component(c) for c in h.components],
+            }
+            for h in api.headers
+        ],
+    }
+
+
+def load_argument(
+        data: Dict[str, Any],
+        names: Dict[str, Component],
+        component: Optional[Component] = None,
+) -> Argument:
+    return Argument(
+        name=data["name"],
+        desc=data["desc"],
+        array=data["array"],
+        optional=data["optional"],
+        default=data["default"],
+        component=component,
+        std_types=data["std_types"],
+        com_types=[names[n] for n in data["com_types"]],
+    )
+
+
+def loads(data: Dict[str, Any]) -> Api:
+    headers = [
+        Header(
+            name=h["name"],
+            anchor=h["anchor"],
+            components=[
+                Component(
+                    name=c["name"],
+                    anchor=c["anchor"],
+                    desc=c["desc"],
+                )
+                for c in h["components"]
+            ],
+        )
+        for h in data["headers"]
+    ]
+    names: Dict[str, Component] = {
+        c.name: c for c in [comps.TELEGRAM_OBJECT, comps.TELEGRAM_PATH]
+    }
+    names.update({c.name: c for h in headers for c in h.components})
+    for h, h_data in zip(headers, data["headers"]):
+        for c, c_data in zip(h.components, h_data["components"]):
+            c.parent = names[c_data["parent"]]
+            c.subclasses = [names[n] for n in c_data["subclasses"]]
+            c.args = [load_argument(a, names, c) for a in c_data["args"]]
+            c.result = load_argument(c_data["result"], names)
+    return Api(version=data["version"], headers=headers)
+
+
+def load(
+        html: str,
+        cache_dir: pathlib.Path,
+        backend: BackendType = BackendType.AUTO,
+) -> Optional[Api]:
+    """
+    Load parsed :class:`Api` of **html** from **cache_dir**
+
+    :param html:
+    :param cache_dir:
+    :param backend: HTML tree builder **html** was parsed with
+    :return: ``None`` on cache miss, corrupt entry is removed and missed
+    """
+    path = cache_dir / f"{key(html, backend)}.json"
+    if not path.is_file():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return loads(json.load(f))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        # truncated or foreign entry, JSONDecodeError and UnicodeDecodeError are ValueError
+        path.unlink(missing_ok=True)
+        return None
+
+
+def save(
+        html: str,
+        api: Api,
+        cache_dir: pathlib.Path,
+        backend: BackendType = BackendType.AUTO,
+):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_dir / f"{key(html, backend)}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dump(api), f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class FormatCache:
+    """
+    Content-addressed store of formatted sources
+
+    Entries are evicted least recently used first
+    once the store grows over **max_size** bytes.
+    """
+
+    def __init__(self, path: pathlib.Path, salt: str = "", max_size: int = FORMAT_CACHE_SIZE):
+        """
+        :param path: directory of entries
+        :param salt: formatter settings and versions, part of every key
+        :param max_size: bytes kept by :meth:`prune`
+        """
+        self.path = path
+        self.salt = salt
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, txt: str) -> str:
+        digest = hashlib.sha256(f"{self.salt}:".encode())
+        digest.update(txt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, txt: str) -> Optional[str]:
+        path = self.path / self.key(txt)
+        try:
+            with open(path, encoding="utf-8") as f:
+                formatted = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return formatted
+
+    def put(self, txt: str, formatted: str):
+        path = self.path / self.key(txt)
+        if path.exists():
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(formatted)
+        os.replace(tmp, path)
+
+    def prune(self):
+        entries = sorted(
+            (e for e in os.scandir(self.path) if e.is_file()),
+            key=lambda e: e.stat().st_mtime,
+        )
+        size = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= entry.stat().st_size
+            os.remove(entry.path)
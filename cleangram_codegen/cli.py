@@ -1,29 +1,170 @@
+import json
 import logging
 import pathlib
+from contextlib import contextmanager
 from textwrap import wrap
+from typing import Iterator, List, Optional
 
 import typer
 
+from . import cache
+from .enums import AdjustType, BackendType, EncodeType, LayoutType, ModelType, OutputType
 from .parser import get_api
 from .generator import Generator
+from .profiler import Profiler
+from .sinks import open_sink
 
 cli = typer.Typer()
 logging.basicConfig(level=logging.INFO)
 
+SPEC_FILE = typer.Option(
+    None, "--spec-file", exists=True, dir_okay=False,
+    help="Saved HTML snapshot of Bot API page",
+)
+CACHE_DIR = typer.Option(
+    cache.CACHE_DIR, "--cache-dir", file_okay=False,
+    help="Directory of parsed Bot API snapshots",
+)
+NO_CACHE = typer.Option(False, "--no-cache", help="Always parse Bot API page")
+JOBS = typer.Option(
+    None, "--jobs", "-j", min=1,
+    help="Formatting processes  [default: every core]",
+)
+BACKEND = typer.Option(
+    BackendType.AUTO.value, "--backend",
+    help="HTML tree builder, auto is lxml if installed and html.parser otherwise",
+)
+PROFILE = typer.Option(
+    False, "--profile",
+    help="Report time and memory of phases and of every file, formatting in one process",
+)
+CPROFILE = typer.Option(
+    None, "--cprofile", dir_okay=False, help="Save cProfile stats of profiled run",
+)
+LAZY_INIT = typer.Option(
+    False, "--lazy-init", help="Import components of packages on first access",
+)
+LAYOUT = typer.Option(
+    LayoutType.SPLIT.value, "--layout",
+    help="Module per component or one module per category of package",
+)
+ADJUST = typer.Option(
+    AdjustType.TREE.value, "--adjust",
+    help="Bind bot to received objects by walking them or through context variable",
+)
+MODEL = typer.Option(
+    ModelType.PYDANTIC.value, "--model-backend",
+    help="Objects as pydantic models or as plain classes with slots, parsed without validation",
+)
+ENCODE = typer.Option(
+    EncodeType.MODEL.value, "--encode",
+    help="Bot methods send path models or payloads encoded without validation "
+         "through post() of Http, files are uploaded as FilePart in streamed multipart bodies",
+)
+SHARED_POOL = typer.Option(
+    False, "--shared-pool",
+    help="Bots of the process share one HTTP client, counted by its users, "
+         "Http of config sends requests of bots through it",
+)
+TOP = typer.Option(20, "--top", min=1, help="Slowest records in profile report")
+OUTPUT = typer.Option(
+    None, "--output", "-o",
+    help="Output directory or archive  [default: current directory or stdout]",
+)
+
+
+@contextmanager
+def profiling(
+        enabled: bool, cprofile: Optional[pathlib.Path], top: int,
+) -> Iterator[Optional[Profiler]]:
+    if not (enabled or cprofile):
+        yield None
+        return
+    with Profiler(cprofile) as profiler:
+        yield profiler
+    typer.echo(profiler.report(top), err=True)
+
 
 @cli.command(name="gen")
-def gen():
-    Generator(True).run()
+def gen(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        no_cache: bool = NO_CACHE,
+        backend: BackendType = BACKEND,
+        jobs: Optional[int] = JOBS,
+        full: bool = typer.Option(
+            False, "--full", help="Regenerate components unchanged since the last run",
+        ),
+        output_type: OutputType = typer.Option(OutputType.DIR.value, "--format"),
+        output: Optional[pathlib.Path] = OUTPUT,
+        profile: bool = PROFILE,
+        cprofile: Optional[pathlib.Path] = CPROFILE,
+        top: int = TOP,
+        lazy_init: bool = LAZY_INIT,
+        layout: LayoutType = LAYOUT,
+        adjust: AdjustType = ADJUST,
+        model: ModelType = MODEL,
+        encode: EncodeType = ENCODE,
+        shared_pool: bool = SHARED_POOL,
+):
+    with profiling(profile, cprofile, top) as profiler:
+        api = get_api(spec_file, None if no_cache else cache_dir, backend, profiler)
+        with open_sink(output_type, output) as sink:
+            Generator(
+                True, cache_dir=None if no_cache else cache_dir, jobs=jobs,
+                incremental=not full, sink=sink, api=api,
+                profiler=profiler, lazy_init=lazy_init, layout=layout, adjust=adjust,
+                model=model, encode=encode, shared_pool=shared_pool,
+            ).run()
 
 
 @cli.command(name="render")
-def render():
-    Generator(False).run()
+def render(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        no_cache: bool = NO_CACHE,
+        backend: BackendType = BACKEND,
+        jobs: Optional[int] = JOBS,
+        output_type: OutputType = typer.Option(OutputType.LOG.value, "--format"),
+        output: Optional[pathlib.Path] = OUTPUT,
+        profile: bool = PROFILE,
+        cprofile: Optional[pathlib.Path] = CPROFILE,
+        top: int = TOP,
+        lazy_init: bool = LAZY_INIT,
+        layout: LayoutType = LAYOUT,
+        adjust: AdjustType = ADJUST,
+        model: ModelType = MODEL,
+        encode: EncodeType = ENCODE,
+        shared_pool: bool = SHARED_POOL,
+):
+    with profiling(profile, cprofile, top) as profiler:
+        api = get_api(spec_file, None if no_cache else cache_dir, backend, profiler)
+        with open_sink(output_type, output) as sink:
+            Generator(
+                False, cache_dir=None if no_cache else cache_dir, jobs=jobs,
+                sink=sink, api=api, profiler=profiler,
+                lazy_init=lazy_init, layout=layout, adjust=adjust, model=model,
+                encode=encode, shared_pool=shared_pool,
+            ).run()
 
 
 @cli.command(name="parse")
-def parse():
-    api = get_api()
+def parse(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        no_cache: bool = NO_CACHE,
+        backend: BackendType = BACKEND,
+        as_json: bool = typer.Option(False, "--json", help="Print parsed Api as JSON"),
+        profile: bool = PROFILE,
+        cprofile: Optional[pathlib.Path] = CPROFILE,
+        top: int = TOP,
+):
+    with profiling(profile, cprofile, top) as profiler:
+        api = get_api(spec_file, None if no_cache else cache_dir, backend, profiler)
+
+    if as_json:
+        typer.echo(json.dumps(cache.dump(api), indent=1))
+        return
 
     typer.echo(f"Version: {api.version}")
 
@@ -43,3 +184,147 @@ def parse():
             typer.echo()
             for a in c.args:
                 typer.echo(f"\t\t{a.name}: {a.annotation}{a.field_value}")
+
+
+@cli.command(name="bench")
+def bench(
+        spec_file: pathlib.Path = typer.Option(
+            ..., "--spec-file", exists=True, dir_okay=False,
+            help="Recorded HTML snapshot of Bot API page",
+        ),
+        factors: List[int] = typer.Option(
+            [1, 2, 4, 8], "--factor", help="Page growth factors",
+        ),
+        repeat: int = typer.Option(3, "--repeat"),
+):
+    from .bench import bench_backends, bench_parse, bench_render
+
+    html = spec_file.read_text(encoding="utf-8")
+    api = get_api(spec_file, None)
+    typer.echo("package\tBotTemplate seconds")
+    for r in bench_render(api, repeat):
+        typer.echo(f"{r['package']}\t{r['seconds']:.4f}")
+    typer.echo()
+    typer.echo("backend\tseconds\tidentical")
+    for r in bench_backends(html, repeat):
+        typer.echo(f"{r['backend']}\t{r['seconds']:.4f}\t{r['identical']}")
+    typer.echo()
+    typer.echo("factor\tcomponents\tseconds\tper component")
+    for r in bench_parse(html, factors, repeat):
+        typer.echo(
+            f"{r['factor']}\t{r['components']}\t"
+            f"{r['seconds']:.4f}\t{r['per_component'] * 1e6:.1f}us"
+        )
+
+
+@cli.command(name="bench-phases")
+def bench_phases(
+        spec_files: List[pathlib.Path] = typer.Option(
+            ..., "--spec-file", exists=True, dir_okay=False,
+            help="Recorded HTML snapshots of Bot API page",
+        ),
+        repeat: int = typer.Option(3, "--repeat"),
+        output: Optional[pathlib.Path] = typer.Option(
+            None, "--output", "-o", dir_okay=False, help="Save report as JSON",
+        ),
+        baseline: Optional[pathlib.Path] = typer.Option(
+            None, "--compare", exists=True, dir_okay=False,
+            help="Report of previous run to compare with",
+        ),
+):
+    from . import bench
+
+    report = bench.bench_phases(spec_files, repeat)
+    if output:
+        output.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    for fixture in report["fixtures"]:
+        typer.echo(
+            f"{fixture['spec_file']}\t{fixture['version']}\t"
+            f"{fixture['components']} components\t{fixture['total']:.4f}s"
+        )
+        for phase, seconds in fixture["phases"].items():
+            typer.echo(f"\t{phase}\t{seconds:.4f}")
+    if baseline:
+        typer.echo()
+        typer.echo("spec file\tphase\told\tnew\tratio")
+        for r in bench.compare(json.loads(baseline.read_text(encoding="utf-8")), report):
+            typer.echo(
+                f"{r['spec_file']}\t{r['phase']}\t{r['old']:.4f}\t{r['new']:.4f}\t{r['ratio']:.2f}"
+            )
+
+
+@cli.command(name="bench-models")
+def bench_models(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        base: pathlib.Path = typer.Option(
+            ..., "--base", exists=True, file_okay=False,
+            help="Directory with hand-written part of cleangram package",
+        ),
+        corpus: Optional[pathlib.Path] = typer.Option(
+            None, "--corpus", exists=True, dir_okay=False,
+            help="JSON list of recorded updates  [default: sampled from Bot API]",
+        ),
+        size: int = typer.Option(100, "--size", min=1, help="Updates in sampled batch"),
+        repeat: int = typer.Option(3, "--repeat"),
+):
+    from . import bench
+
+    api = get_api(spec_file, cache_dir)
+    if corpus:
+        updates = json.loads(corpus.read_text(encoding="utf-8"))
+    else:
+        updates = bench.sample_updates(api, size)
+    typer.echo("model\tpath\tupdates\tseconds\tper update\tbytes\tper update")
+    for r in bench.bench_models(api, base, updates, repeat):
+        typer.echo(
+            f"{r['model']}\t{r['path']}\t{r['updates']}\t{r['seconds']:.4f}\t"
+            f"{r['per_update'] * 1e6:.1f}us\t{r['bytes']}\t{r['per_update_bytes']:.0f}"
+        )
+
+
+@cli.command(name="bench-upload")
+def bench_upload(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        base: pathlib.Path = typer.Option(
+            ..., "--base", exists=True, file_okay=False,
+            help="Directory with hand-written part of cleangram package",
+        ),
+        files: int = typer.Option(10, "--files", min=1, help="Files in uploaded album"),
+        size: int = typer.Option(16, "--size", min=1, help="Megabytes of every file"),
+):
+    from . import bench
+
+    api = get_api(spec_file, cache_dir)
+    typer.echo("way\tfiles\tmegabytes\tseconds\tpeak RSS, MB")
+    for r in bench.bench_upload(api, base, files, size * 2 ** 20):
+        typer.echo(
+            f"{r['way']}\t{r['files']}\t{r['bytes'] / 2 ** 20:.0f}\t"
+            f"{r['seconds']:.4f}\t{r['peak_rss'] / 2 ** 20:.1f}"
+        )
+
+
+@cli.command(name="bench-imports")
+def bench_imports(
+        spec_file: Optional[pathlib.Path] = SPEC_FILE,
+        cache_dir: pathlib.Path = CACHE_DIR,
+        base: pathlib.Path = typer.Option(
+            ..., "--base", exists=True, file_okay=False,
+            help="Directory with hand-written part of cleangram package",
+        ),
+        modules: List[str] = typer.Option(
+            ["cleangram.aio.objects", "cleangram.aio.paths"], "--module",
+            help="Imported modules of generated package",
+        ),
+        repeat: int = typer.Option(3, "--repeat"),
+):
+    from . import bench
+
+    api = get_api(spec_file, cache_dir)
+    typer.echo("layout\tmodule\tseconds\tmodules\tRSS, MB")
+    for r in bench.bench_imports(api, base, modules, repeat):
+        typer.echo(
+            f"{r['layout']}\t{r['module']}\t{r['seconds']:.4f}\t"
+            f"{r['modules']}\t{r['rss'] / 2 ** 20:.1f}"
+        )
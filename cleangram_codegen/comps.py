@@ -1,8 +1,9 @@
 from .models import Component
 
-TELEGRAM_PATH = Component(name="telegramPath", _module="base")
+TELEGRAM_PATH = Component(name="telegramPath", _module="base").finalize()
 
-TELEGRAM_OBJECT = Component(name="TelegramObject", _module="base")
-TELEGRAM_T = Component(name="T", _module="response")
-TELEGRAM_RESPONSE = Component(name="Response", _module="response")
-TELEGRAM_REQUEST = Component(name="Request", _module="request")
+TELEGRAM_OBJECT = Component(name="TelegramObject", _module="base").finalize()
+SLOTS_OBJECT = Component(name="TelegramObject", _module="slots").finalize()
+TELEGRAM_T = Component(name="T", _module="response").finalize()
+TELEGRAM_RESPONSE = Component(name="Response", _module="response").finalize()
+TELEGRAM_REQUEST = Component(name="Request", _module="request").finalize()
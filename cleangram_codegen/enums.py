@@ -10,3 +10,38 @@ class PackageType(Enum):
     CORE: str = "core"
     AIO: str = "aio"
     SYNC: str = "sync"
+
+
+class BackendType(Enum):
+    AUTO: str = "auto"
+    HTML_PARSER: str = "html.parser"
+    LXML: str = "lxml"
+    STREAM: str = "stream"
+
+
+class OutputType(Enum):
+    DIR: str = "dir"
+    LOG: str = "log"
+    TAR: str = "tar"
+    TGZ: str = "tgz"
+    ZIP: str = "zip"
+
+
+class LayoutType(Enum):
+    SPLIT: str = "split"
+    BUNDLED: str = "bundled"
+
+
+class AdjustType(Enum):
+    TREE: str = "tree"
+    CONTEXT: str = "context"
+
+
+class ModelType(Enum):
+    PYDANTIC: str = "pydantic"
+    SLOTS: str = "slots"
+
+
+class EncodeType(Enum):
+    MODEL: str = "model"
+    DIRECT: str = "direct"
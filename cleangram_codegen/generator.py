@@ -1,75 +1,227 @@
 import logging
 import os
 import pathlib
+import time
 import typing
-from typing import List, Type, Set
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Deque, Dict, Iterable, List, Optional, Type, Set, Tuple
 
 import black
 import isort
 
-from . import const
-from .enums import PackageType, CategoryType
-from .models import Component
+from . import cache, const, manifest
+from .enums import AdjustType, BackendType, CategoryType, EncodeType, LayoutType, ModelType, \
+    OutputType, PackageType
+from .models import Api, Component
 from .parser import get_api
+from .profiler import Profiler, measure
+from .sinks import Sink, open_sink
 from .templates import Template, VersionTemplate, ObjectTemplate, PathTemplate, ComponentTemplate, \
-    InitComponentsTemplate, BotTemplate
+    InitComponentsTemplate, BotTemplate, DecodersTemplate, EncodersTemplate
+from .util import snake
 
 
-def md(path: pathlib.Path):
-    os.makedirs(path, exist_ok=True)
+def format_code(txt: str, mode: black.Mode) -> str:
+    return black.format_str(isort.code(txt), mode=mode)
+
+
+def done(result: str) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
 
 
 class Generator:
-    def __init__(self, is_gen: bool = True):
-        self.is_gen = is_gen
-        self.api = get_api()
+    def __init__(
+            self,
+            is_gen: bool = True,
+            spec_file: Optional[pathlib.Path] = None,
+            cache_dir: Optional[pathlib.Path] = cache.CACHE_DIR,
+            backend: BackendType = BackendType.AUTO,
+            jobs: Optional[int] = None,
+            incremental: bool = True,
+            sink: Optional[Sink] = None,
+            api: Optional[Api] = None,
+            profiler: Optional[Profiler] = None,
+            lazy_init: bool = False,
+            layout: LayoutType = LayoutType.SPLIT,
+            adjust: AdjustType = AdjustType.TREE,
+            model: ModelType = ModelType.PYDANTIC,
+            encode: EncodeType = EncodeType.MODEL,
+            shared_pool: bool = False,
+    ):
+        """
+        :param is_gen: write files to current directory, log them otherwise
+        :param spec_file: saved HTML snapshot of Bot API page
+        :param cache_dir: directory of parsed snapshots and formatted files,
+            ``None`` disables the cache
+        :param backend: HTML tree builder
+        :param jobs: formatting processes, every core if ``None``
+        :param incremental: regenerate only components changed since the last run
+        :param sink: destination of files, overrides **is_gen**
+        :param api: finalized api, overrides **spec_file**
+        :param profiler: measures every phase, rendering and formatting of every file,
+            formatting runs in this process then
+        :param lazy_init: import components of packages on first access,
+            split layout only
+        :param layout: module per component or per category of package
+        :param adjust: bind bot to received objects by walking them
+            or through context variable
+        :param model: base of objects, pydantic models or plain classes with slots,
+            slots imply binding through context variable
+        :param encode: send path models or payloads encoded by generated functions
+            through ``post(bot, path, payload, timeout)`` of Http,
+            models are still built and validated when ``Bot.__validate__`` is set
+        :param shared_pool: bots of the process share one HTTP client, closed with the last bot,
+            Http of config sends path models and payloads of bots through it
+        """
+        self.sink = sink or open_sink(OutputType.DIR if is_gen else OutputType.LOG)
+        self.profiler = profiler
+        self.api = api or get_api(spec_file, cache_dir, backend, profiler)
         self.mode = black.Mode(
             target_versions={black.TargetVersion.PY38},
             line_length=79,
             string_normalization=False,
             is_pyi=False,
         )
-        self.root = pathlib.Path().absolute()
-        self.code = self.root / "cleangram"
+        self.code = pathlib.PurePath("cleangram")
         self.log = logging.getLogger("Generator")
+        self.jobs = 1 if profiler else jobs or os.cpu_count() or 1
+        self.pool: Optional[Executor] = None
+        self.queue: Deque[Tuple[pathlib.PurePath, str, Optional[Future]]] = deque()
+        self.format_salt = f"{self.mode.get_cache_key()}:{black.__version__}:{isort.__version__}"
+        self.format_cache: Optional[cache.FormatCache] = None
+        if cache_dir:
+            self.format_cache = cache.FormatCache(cache_dir / "format", salt=self.format_salt)
+        self.incremental = incremental
+        self.layout = layout
+        self.bundled = layout == LayoutType.BUNDLED
+        self.lazy_init = lazy_init and not self.bundled
+        self.adjust = adjust
+        self.model = model
+        self.slots = model == ModelType.SLOTS
+        self.encode = encode
+        # settings of package templates
+        self.options = dict(
+            bundled=self.bundled,
+            bind_context=adjust == AdjustType.CONTEXT or self.slots,
+            slots=self.slots,
+            direct=encode == EncodeType.DIRECT,
+            shared_pool=shared_pool,
+        )
+        self.changed: Optional[Set[str]] = None
+        self.timings: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def timed(self, phase: str, tmp: Optional[Type[Template]] = None, **kwargs):
+        """
+        Add wall time of the block to :attr:`timings` of **phase**,
+        rendering is accounted to template class
+
+        :param phase:
+        :param tmp: class of processed template, labels profiler record
+        :param kwargs: arguments of processed template, label profiler record
+        """
+        labels = {}
+        if self.profiler and tmp:
+            com: Optional[Component] = kwargs.get("com")
+            package: Optional[PackageType] = kwargs.get("package")
+            labels = dict(
+                package=package and package.value,
+                component=com and com.name,
+                template=tmp.__name__,
+            )
+        start = time.perf_counter()
+        try:
+            with measure(self.profiler, phase, **labels):
+                yield
+        finally:
+            key = tmp.__name__ if phase == "render" else phase
+            self.timings[key] += time.perf_counter() - start
+
+    def _gen(self, path: pathlib.PurePath, tmp: Type[Template], **kwargs):
+        """
+        Render template **tmp** built of **kwargs** into **path**
 
-    def _gen(self, tmp: Template, path: pathlib.Path):
-        # render
-        txt = str(tmp)
-        str_path = str(path.relative_to(path.cwd()))
+        Templates emit their code while being built,
+        so they are built inside of timed rendering.
+        """
+        with self.timed("render", tmp, **kwargs):
+            txt = str(tmp(**kwargs))
+        formatted = None
         if path.suffix == ".py":
-            try:
-                txt = black.format_str(
-                    isort.code(txt),
-                    mode=self.mode
-                )
-            except Exception as e:
-                self.log.exception(txt)
-                raise e
-        if self.is_gen:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(txt)
-                self.log.info(str_path)
-        else:
-            self.log.info(f"{str_path}\n{txt}")
+            if self.format_cache and (hit := self.format_cache.get(txt)) is not None:
+                formatted = done(hit)
+            elif self.pool:
+                formatted = self.pool.submit(format_code, txt, self.mode)
+            else:
+                formatted = Future()
+                try:
+                    with self.timed("format", tmp, **kwargs):
+                        formatted.set_result(format_code(txt, self.mode))
+                except Exception as e:
+                    formatted.set_exception(e)
+        self.queue.append((path, txt, formatted))
+        self._drain(wait=False)
+
+    def _drain(self, wait: bool = True):
+        """
+        Write formatted files in order of rendering
+
+        :param wait: block until the whole queue is written
+        :return:
+        """
+        while self.queue:
+            path, txt, formatted = self.queue[0]
+            if formatted:
+                if not (wait or formatted.done()):
+                    return
+                try:
+                    result = formatted.result()
+                except Exception as e:
+                    self.log.exception(txt)
+                    raise e
+                if self.format_cache:
+                    self.format_cache.put(txt, result)
+                txt = result
+            self.queue.popleft()
+            with self.timed("write"):
+                self.sink.write(path, txt)
+
+    def _outdated(self, path: pathlib.PurePath, com: Optional[Component] = None) -> bool:
+        """
+        Whether **path** should be regenerated
+
+        :param path:
+        :param com: rendered component, output depends on every component if ``None``
+        :return:
+        """
+        if self.changed is None or not self.sink.exists(path):
+            return True
+        if com:
+            return com.name in self.changed
+        return bool(self.changed)
 
     def gen_version(self):
-        self._gen(
-            VersionTemplate(self.api),
-            self.code / "_version.py"
-        )
+        if not self._outdated(self.code / "_version.py"):
+            return
+        self._gen(self.code / "_version.py", VersionTemplate, api=self.api)
 
     def gen_init(self, pt: PackageType):
         for ct in CategoryType:
             path = self.code / pt.value / ct.value
-            md(path)
+            if not self._outdated(path / "__init__.py"):
+                continue
             self._gen(
-                InitComponentsTemplate(
-                    api=self.api,
-                    package=pt,
-                    ct=ct,
-                ),
-                path / "__init__.py"
+                path / "__init__.py",
+                InitComponentsTemplate,
+                api=self.api,
+                package=pt,
+                ct=ct,
+                lazy=self.lazy_init,
+                **self.options,
             )
 
     def gen_components(self, pt: PackageType):
@@ -78,31 +230,93 @@ class Generator:
                 (CategoryType.PATH, PathTemplate, self.api.paths)
         ):
             for com in components:  # type: Component
-                if pt != PackageType.CORE and not com.is_adjusted:
+                path = self.code / pt.value / category.value / f"{com.module}.py"
+                if self.bundled or (pt != PackageType.CORE and not com.is_adjusted):
+                    self.sink.remove(path)
+                    continue
+                if not self._outdated(path, com):
                     continue
                 self._gen(
-                    Tmp(
-                        api=self.api,
-                        package=pt,
-                        com=com
-                    ),
-                    self.code / pt.value / category.value / f"{com.module}.py"
+                    path,
+                    Tmp,
+                    api=self.api,
+                    package=pt,
+                    com=com,
+                    **self.options,
                 )
 
+    def gen_decoders(self, pt: PackageType):
+        if pt == PackageType.CORE:
+            return
+        path = self.code / pt.value / CategoryType.OBJECT.value / "decoders.py"
+        if not self._outdated(path):
+            return
+        self._gen(
+            path,
+            DecodersTemplate,
+            api=self.api,
+            package=pt,
+            **self.options,
+        )
+
+    def gen_encoders(self):
+        path = self.code / PackageType.CORE.value / CategoryType.PATH.value / "encoders.py"
+        if not self.options["direct"]:
+            self.sink.remove(path)
+            return
+        if not self._outdated(path):
+            return
+        self._gen(path, EncodersTemplate, api=self.api, package=PackageType.CORE)
+
     def gen_bot(self, pt: PackageType):
         bot_dir = self.code / pt.value / "bot"
-        md(bot_dir)
+        if not self._outdated(bot_dir / "bot.py"):
+            return
         self._gen(
-            BotTemplate(
-                api=self.api,
-                package=pt
-            ),
-            bot_dir / "bot.py"
+            bot_dir / "bot.py",
+            BotTemplate,
+            api=self.api,
+            package=pt,
+            **self.options,
         )
 
+    def remove_components(self, names: Iterable[str]):
+        for name in names:
+            category = CategoryType.OBJECT if name[0].isupper() else CategoryType.PATH
+            for pt in PackageType:
+                self.sink.remove(self.code / pt.value / category.value / f"{snake(name)}.py")
+
     def run(self):
-        self.gen_version()
-        for pt in PackageType:
-            self.gen_init(pt)
-            self.gen_components(pt)
-            self.gen_bot(pt)
+        manifest_path = self.code / manifest.MANIFEST
+        new = manifest.build(self.api, ":".join([
+            self.format_salt,
+            f"lazy_init={self.lazy_init}",
+            f"layout={self.layout.value}",
+            f"adjust={self.adjust.value}",
+            f"model={self.model.value}",
+            f"encode={self.encode.value}",
+            f"shared_pool={self.options['shared_pool']}",
+        ]))
+        old = manifest.loads(self.sink.read(manifest_path))
+        self.changed = manifest.diff(old, new) if self.incremental else None
+        if self.changed is not None:
+            self.log.info(f"Changed components: {len(self.changed)}")
+        with ExitStack() as stack:
+            stack.enter_context(self.sink)
+            if self.jobs > 1:
+                self.pool = stack.enter_context(ProcessPoolExecutor(self.jobs))
+                stack.callback(setattr, self, "pool", None)
+            self.gen_version()
+            self.gen_encoders()
+            for pt in PackageType:
+                with measure(self.profiler, "gen", package=pt.value):
+                    self.gen_init(pt)
+                    self.gen_components(pt)
+                    self.gen_decoders(pt)
+                    self.gen_bot(pt)
+            self._drain()
+            if self.sink.persistent:
+                self.remove_components(manifest.removed(old, new))
+                self.sink.write(manifest_path, manifest.dumps(new))
+        if self.format_cache:
+            self.format_cache.prune()
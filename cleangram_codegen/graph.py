@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from .models import Component
+
+
+class Graph:
+    """
+    Dependency graph of components
+
+    Component depends on every object it uses in arguments or result.
+    Edges are kept in both directions, sorted by name,
+    so every traversal is linear and deterministic.
+    """
+
+    def __init__(self, components: Iterable[Component]):
+        self.nodes: Tuple[Component, ...] = tuple(components)
+        forward: Dict[Component, List[Component]] = {c: [] for c in self.nodes}
+        reverse: Dict[Component, List[Component]] = {c: [] for c in self.nodes}
+        for c in self.nodes:
+            for o in sorted(c.used_objects, key=str):
+                if o in forward:
+                    forward[c].append(o)
+                    reverse[o].append(c)
+        self.forward: Dict[Component, Tuple[Component, ...]] = {
+            c: tuple(deps) for c, deps in forward.items()
+        }
+        self.reverse: Dict[Component, Tuple[Component, ...]] = {
+            c: tuple(sorted(deps, key=str)) for c, deps in reverse.items()
+        }
+
+    def dependencies(self, c: Component) -> Tuple[Component, ...]:
+        """
+        Components used by **c**
+
+        :param c:
+        :return:
+        """
+        return self.forward[c]
+
+    def dependents(self, c: Component) -> Tuple[Component, ...]:
+        """
+        Components using **c**
+
+        :param c:
+        :return:
+        """
+        return self.reverse[c]
+
+    def topo_order(self) -> List[Component]:
+        """
+        Components ordered dependencies first
+
+        Cycles are broken at the edge closing them.
+
+        :return:
+        """
+        order: List[Component] = []
+        seen: Set[Component] = set()
+        for root in self.nodes:
+            if root in seen:
+                continue
+            seen.add(root)
+            stack = [(root, iter(self.forward[root]))]
+            while stack:
+                c, deps = stack[-1]
+                for dep in deps:
+                    if dep not in seen:
+                        seen.add(dep)
+                        stack.append((dep, iter(self.forward[dep])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(c)
+        return order
+
+    def adjusted(
+            self,
+            roots: Iterable[Component],
+            aliased: FrozenSet[Component],
+    ) -> FrozenSet[Component]:
+        """
+        Components bound to bot
+
+        Scope is every component reachable from **roots**
+        without descending below **aliased** ones.
+        Component in scope is adjusted if it is aliased
+        or uses an adjusted component,
+        found walking reverse edges from aliased components once.
+
+        :param roots:
+        :param aliased:
+        :return:
+        """
+        scope: Set[Component] = set()
+        queue = deque()
+        for root in roots:
+            if root not in scope:
+                scope.add(root)
+                queue.append(root)
+        while queue:
+            c = queue.popleft()
+            if c in aliased:
+                continue
+            for dep in self.forward[c]:
+                if dep not in scope:
+                    scope.add(dep)
+                    queue.append(dep)
+
+        adjusted = {c for c in aliased if c in scope}
+        queue.extend(adjusted)
+        while queue:
+            for c in self.reverse[queue.popleft()]:
+                if c in scope and c not in adjusted:
+                    adjusted.add(c)
+                    queue.append(c)
+        return frozenset(adjusted)
@@ -0,0 +1,159 @@
+import importlib.abc
+import importlib.util
+import itertools
+import linecache
+import pathlib
+import sys
+from contextlib import contextmanager
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import FrozenSet, Iterator, Mapping, Optional, Set
+
+from .sinks import MemorySink
+
+
+class MemoryLoader(importlib.abc.InspectLoader):
+    """
+    Execute module source kept in memory
+
+    Modules are named by their path in **files** under **prefix** package.
+    """
+
+    def __init__(self, files: Mapping[str, str], prefix: str = ""):
+        self.files = files
+        self.prefix = prefix
+
+    def relative(self, fullname: str) -> Optional[str]:
+        """
+        Posix path of module **fullname** in :attr:`files`
+
+        :param fullname:
+        :return: empty for **prefix** package, ``None`` for modules outside of it
+        """
+        if not self.prefix:
+            return fullname.replace(".", "/")
+        if fullname == self.prefix:
+            return ""
+        if fullname.startswith(f"{self.prefix}."):
+            return fullname[len(self.prefix) + 1:].replace(".", "/")
+        return None
+
+    def get_source(self, fullname: str) -> Optional[str]:
+        rel = self.relative(fullname)
+        if not rel:
+            return ""
+        return self.files.get(f"{rel}.py", self.files.get(f"{rel}/__init__.py", ""))
+
+    def is_package(self, fullname: str) -> bool:
+        return f"{self.relative(fullname)}.py" not in self.files
+
+    def exec_module(self, module):
+        source = self.get_source(module.__name__)
+        origin = module.__spec__.origin
+        linecache.cache[origin] = (len(source), None, source.splitlines(True), origin)
+        exec(compile(source, origin, "exec"), module.__dict__)
+
+
+class MemoryFinder(importlib.abc.MetaPathFinder):
+    """
+    Find modules among generated files kept in memory
+
+    Modules missing in memory are left to the regular finders,
+    packages present in memory also search **base** directory,
+    so generated modules are imported along with hand-written ones.
+    """
+
+    def __init__(
+            self,
+            files: Mapping[str, str],
+            base: Optional[pathlib.Path] = None,
+            prefix: str = "",
+    ):
+        """
+        :param files: module sources by posix path, like ``cleangram/core/bot/bot.py``
+        :param base: directory with hand-written part of package
+        :param prefix: package containing generated ones, their real names if empty
+        """
+        self.files = files
+        self.base = base
+        self.prefix = prefix
+        self.loader = MemoryLoader(files, prefix)
+        self.packages: FrozenSet[str] = frozenset(
+            "/".join(parts[:i])
+            for parts in (path.split("/") for path in self.files)
+            for i in range(1, len(parts))
+        )
+
+    def import_module(self, name: str) -> ModuleType:
+        """
+        Import generated module **name**, like ``cleangram.aio.objects``, under prefix
+        """
+        return importlib.import_module(f"{self.prefix}.{name}" if self.prefix else name)
+
+    def find_spec(self, fullname: str, path=None, target=None) -> Optional[ModuleSpec]:
+        rel = self.loader.relative(fullname)
+        if rel is None:
+            return None
+        origin = f"<memory>/{fullname.replace('.', '/')}"
+        if f"{rel}.py" in self.files:
+            return importlib.util.spec_from_loader(
+                fullname, self.loader, origin=f"{origin}.py",
+            )
+        if rel and rel not in self.packages:
+            return None
+
+        locations = [origin]
+        if rel and self.base and (self.base / rel).is_dir():
+            locations.append(str(self.base / rel))
+            init = self.base / rel / "__init__.py"
+            if f"{rel}/__init__.py" not in self.files and init.is_file():
+                return importlib.util.spec_from_file_location(
+                    fullname, init, submodule_search_locations=locations,
+                )
+        spec = ModuleSpec(
+            fullname, self.loader, origin=f"{origin}/__init__.py", is_package=True,
+        )
+        spec.submodule_search_locations = locations
+        return spec
+
+
+def unload(names: Set[str]):
+    """
+    Remove packages **names** and their submodules from :data:`sys.modules`
+    """
+    for name in list(sys.modules):
+        if name.split(".", 1)[0] in names:
+            del sys.modules[name]
+
+
+MOUNTS = itertools.count()
+
+
+@contextmanager
+def mount(
+        sink: MemorySink,
+        base: Optional[pathlib.Path] = None,
+        prefix: Optional[str] = None,
+) -> Iterator[MemoryFinder]:
+    """
+    Import generated package from **sink** inside the block
+
+    Generated packages are mounted under own **prefix** package,
+    like ``_cleangram_mount_0.cleangram``, so several versions are imported
+    side by side and installed package is left alone.
+    Import them with :meth:`MemoryFinder.import_module`.
+    Modules under **prefix** are unloaded on exit.
+
+    :param sink: rendered by :class:`.generator.Generator`
+    :param base: directory with hand-written part of package
+    :param prefix: unique per mount if omitted
+    :return:
+    """
+    finder = MemoryFinder(sink.files, base, prefix or f"_cleangram_mount_{next(MOUNTS)}")
+    sys.meta_path.insert(0, finder)
+    try:
+        yield finder
+    finally:
+        sys.meta_path.remove(finder)
+        unload({finder.prefix})
+        importlib.invalidate_caches()
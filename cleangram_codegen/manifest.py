@@ -0,0 +1,113 @@
+import hashlib
+import inspect
+import json
+from typing import Any, Dict, Iterable, Optional, Set
+
+from . import templates
+from .models import Api, Argument, Component
+
+MANIFEST = ".codegen.json"
+
+
+def source_digest() -> str:
+    """
+    Digest of templates source, any change of it invalidates manifest
+
+    :return:
+    """
+    return hashlib.sha256(inspect.getsource(templates).encode("utf-8")).hexdigest()
+
+
+def _argument(arg: Argument) -> Dict[str, Any]:
+    return {
+        "name": arg.name,
+        "annotation": arg.annotation,
+        "field_value": arg.field_value,
+        "desc": arg.desc,
+        "com_types": sorted(t.name for t in arg.com_types),
+    }
+
+
+def _structure(com: Component) -> Dict[str, Any]:
+    return {
+        "name": com.name,
+        "anchor": com.anchor,
+        "parent": com.parent.name,
+        "desc": com.desc,
+        "subclasses": [sub.name for sub in com.subclasses],
+        "args": [_argument(a) for a in com.args],
+        "result": _argument(com.result),
+    }
+
+
+def digest(com: Component) -> str:
+    """
+    Structural hash of everything rendered for **com**
+
+    Covers own name, arguments and result, adjusted status of **com**
+    and of used objects, and paths aliased by **com**.
+
+    :param com:
+    :return:
+    """
+    data = {
+        **_structure(com),
+        "is_adjusted": bool(com.is_adjusted),
+        "is_prepared": bool(com.is_prepared),
+        "used": sorted([o.name, bool(o.is_adjusted)] for o in com.used_objects),
+        "aliased": [_structure(p) for p in com.aliased_paths],
+    }
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def build(api: Api, salt: str = "") -> Dict[str, Any]:
+    """
+    :param api:
+    :param salt: output settings, any change of it invalidates manifest
+    :return:
+    """
+    return {
+        "version": api.version,
+        "salt": f"{source_digest()}:{salt}",
+        "components": {
+            c.name: digest(c) for c in [*api.objects, *api.paths]
+        },
+    }
+
+
+def diff(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Optional[Set[str]]:
+    """
+    Names of components changed since **old** manifest
+
+    :param old:
+    :param new:
+    :return: ``None`` if everything should be regenerated
+    """
+    if not old or any(old.get(k) != new[k] for k in ("salt", "version")):
+        return None
+    return {
+        name
+        for name, hsh in new["components"].items()
+        if old["components"].get(name) != hsh
+    }
+
+
+def removed(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Iterable[str]:
+    if not old:
+        return []
+    return sorted(set(old["components"]) - set(new["components"]))
+
+
+def loads(txt: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not txt:
+        return None
+    try:
+        return json.loads(txt)
+    except json.JSONDecodeError:
+        return None
+
+
+def dumps(manifest: Dict[str, Any]) -> str:
+    return json.dumps(manifest, indent=1, sort_keys=True)
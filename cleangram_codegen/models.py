@@ -1,21 +1,35 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass as dc
 from dataclasses import field
-from functools import lru_cache
-from typing import List, Optional, Set, Union
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
 
 from bs4 import Tag
 
 from . import const
 from .enums import CategoryType
-from .util import snake, wrap
+from .graph import Graph
+from .util import Final, slots, snake, wrap
 
 
+# value of field telling subclasses apart, like "Type of the result, must be photo"
+VARIANT = re.compile(r"\b(?:must be|always) [“\"]?([a-z_]+)[”\"]?")
+
+
+def derived():
+    """
+    Field computed on finalization
+    """
+    return field(init=False, repr=False, compare=False)
+
+
+@slots
 @dc(repr=False)
-class Argument:
+class Argument(Final):
     name: str = ""
-    desc: Optional[Tag] = None
+    desc: str = ""
     array: int = 0
     optional: bool = False
     default: Optional[str] = None
@@ -23,43 +37,31 @@ class Argument:
     std_types: List[str] = field(default_factory=list)
     com_types: List[Union[str, Component]] = field(default_factory=list)
 
-    @property
-    @lru_cache()
-    def union(self):
-        return (len(self.std_types) + len(self.com_types)) > 1
+    union: bool = derived()
+    field_value: str = derived()
+    method_value: str = derived()
+    annotation: str = derived()
+    field: str = derived()
 
-    @property
-    @lru_cache()
-    def field(self) -> str:
-        if self.name in {"from"}:
-            return f"{self.name}_"
-        return self.name
+    def derive(self) -> Argument:
+        self.union = (len(self.std_types) + len(self.com_types)) > 1
+        self.field = f"{self.name}_" if self.name in {"from"} else self.name
 
-    @property
-    @lru_cache()
-    def field_value(self):
         if self.name in {"from"}:
-            return f" = Field(alias={self.name!r})"
+            self.field_value = f" = Field(alias={self.name!r})"
         elif self.default:
-            return f" = {self.default!r}"
+            self.field_value = f" = {self.default!r}"
         elif self.array and self.component and self.component.is_object:
-            return f" = Field(default_factory=list)"
+            self.field_value = f" = Field(default_factory=list)"
         elif self.optional:
-            return f" = None"
+            self.field_value = f" = None"
         else:
-            return ""
-
-    @property
-    @lru_cache()
-    def method_value(self) -> str:
-        return "=None" if self.optional else ""
+            self.field_value = ""
 
-    @property
-    @lru_cache()
-    def annotation(self) -> str:
-        none = {"None"} if self.union and self.optional else set()
+        self.method_value = "=None" if self.optional else ""
 
-        return wrap(
+        none = ["None"] if self.union and self.optional else []
+        self.annotation = wrap(
             "Optional",
             self.optional and not self.union,
             wrap(
@@ -71,27 +73,28 @@ class Argument:
                     wrap(
                         "Union",
                         self.union,
-                        ", ".join(map(str, {*self.std_types, *self.com_types, *none})),
+                        ", ".join(dict.fromkeys(
+                            map(str, [*self.std_types, *self.com_types, *none])
+                        )),
                     ),
                 ),
             ),
         )
+        return self
 
-    @lru_cache()
     def __bool__(self):
         return bool(self.std_types) or bool(self.com_types)
 
     def __hash__(self):
         return hash(self.name)
 
-
-    @lru_cache()
     def __str__(self):
         return self.field
 
 
+@slots
 @dc
-class Component:
+class Component(Final):
     name: str
     anchor: Optional[str] = field(default=None, repr=False)
     tag: Optional[Tag] = field(default=None, repr=False)
@@ -99,74 +102,115 @@ class Component:
     result: Argument = field(repr=False, default_factory=Argument)
     _module: Optional[str] = field(default=None, repr=False)
     parent: Optional[Component] = None
-    desc: List[Tag] = field(default_factory=list)
-    has_field: bool = False
+    desc: List[str] = field(default_factory=list)
     subclasses: List[Component] = field(default_factory=list)
     api: Optional[Api] = None
 
-    @property
-    @lru_cache()
-    def is_path(self):
-        return self.category == CategoryType.PATH
-
-    @property
-    @lru_cache()
-    def is_object(self):
-        return self.category == CategoryType.OBJECT
-
-    @property
-    @lru_cache()
-    def snake(self):
-        return snake(self.name)
-
-    @property
-    @lru_cache()
-    def camel(self):
-        return self.name[0].upper() + self.name[1:]
-
-    @property
-    @lru_cache()
-    def category(self):
-        return CategoryType.OBJECT if self.name[0].isupper() else CategoryType.PATH
-
-    @property
-    @lru_cache()
-    def module(self) -> str:
-        return self._module if self._module else self.snake
-
-    @property
-    @lru_cache()
-    def args_objects(self) -> Set[Component]:
-        return {t for a in self.args for t in a.com_types if t != self}
-
-    @property
-    @lru_cache()
-    def result_objects(self) -> Set[Component]:
-        return {*self.result.com_types}
-
-    @property
-    @lru_cache()
-    def used_objects(self) -> Set[Component]:
-        return {*self.args_objects, *self.result_objects}
-
-    @property
-    @lru_cache()
-    def args_typing(self) -> Set[str]:
-        return self.get_typing(*self.args)
-
-    @property
-    @lru_cache()
-    def result_typing(self) -> Set[str]:
-        return self.get_typing(self.result)
+    category: CategoryType = derived()
+    is_path: bool = derived()
+    is_object: bool = derived()
+    snake: str = derived()
+    camel: str = derived()
+    module: str = derived()
+    has_field: bool = derived()
+    args_objects: FrozenSet[Component] = derived()
+    result_objects: FrozenSet[Component] = derived()
+    used_objects: FrozenSet[Component] = derived()
+    args_typing: FrozenSet[str] = derived()
+    result_typing: FrozenSet[str] = derived()
+    used_typing: FrozenSet[str] = derived()
+    is_adjusted: bool = derived()
+    is_aliased: bool = derived()
+    aliased_paths: Tuple[Component, ...] = derived()
+    adjusted_objects: Tuple[Component, ...] = derived()
+    adjusted_typing: FrozenSet[str] = derived()
+    is_prepared: bool = derived()
+    discriminator: Optional[str] = derived()
+    variants: Mapping[str, Component] = derived()
+
+    def __post_init__(self):
+        self.category = CategoryType.OBJECT if self.name[0].isupper() else CategoryType.PATH
+        self.is_path = self.category == CategoryType.PATH
+        self.is_object = self.category == CategoryType.OBJECT
+        self.snake = snake(self.name)
+        self.camel = self.name[0].upper() + self.name[1:]
+        self.module = self._module if self._module else self.snake
+
+    def derive(self) -> Component:
+        """
+        Compute attributes of component itself and of its arguments
+        """
+        for a in self.args:
+            a.derive()
+        self.result.derive()
+
+        self.has_field = any("Field" in a.field_value for a in self.args)
+        self.args_objects = frozenset(t for a in self.args for t in a.com_types if t != self)
+        self.result_objects = frozenset(self.result.com_types)
+        self.used_objects = self.args_objects | self.result_objects
+        self.args_typing = self.get_typing(*self.args)
+        self.result_typing = self.get_typing(self.result)
+        self.used_typing = self.args_typing | self.result_typing
+        self.discriminator, self.variants = self.get_variants()
+        return self
+
+    def relate(self) -> Component:
+        """
+        Compute attributes depending on the whole :attr:`api`
+        """
+        api = self.api
+        self.is_adjusted = bool(api) and (
+            (self.is_path and self in api.adjusted_paths) or
+            (self.is_object and self in api.adjusted_objects)
+        )
+        self.is_aliased = bool(api) and self.is_object and self in api.aliased_objects
+        self.aliased_paths = api.aliased_by[self] if self.is_aliased else ()
+        self.is_prepared = bool(api) and self.is_path and (
+                api.input_file in self.used_objects or
+                self.name == "sendMediaGroup" or
+                any([a.name in const.PRESETS for a in self.args])
+        )
+        return self
 
-    @property
-    @lru_cache()
-    def used_typing(self) -> Set[str]:
-        return {*self.args_typing, *self.result_typing}
+    def relate_adjusted(self) -> Component:
+        self.adjusted_objects = tuple(o for o in self.args_objects if o.is_adjusted)
+        self.adjusted_typing = self.get_typing(*{
+            a for a in self.args if any([c.is_adjusted for c in a.com_types])
+        })
+        return self
+
+    def freeze(self) -> Component:
+        for a in self.args:
+            a.freeze()
+        self.result.freeze()
+        return super(Component, self).freeze()
+
+    def finalize(self) -> Component:
+        """
+        Finalize component which is not a part of :class:`Api`
+        """
+        return self.derive().relate().relate_adjusted().freeze()
+
+    def get_variants(self) -> Tuple[Optional[str], Mapping[str, Component]]:
+        """
+        Field of subclasses telling them apart and subclass by its value,
+        like ``type`` of ``InputMedia`` or ``status`` of ``ChatMember``
+
+        :return: ``None`` and no subclasses unless every subclass has own value
+        """
+        tags = [
+            {a.name: m.group(1) for a in sub.args if (m := VARIANT.search(a.desc))}
+            for sub in self.subclasses
+        ]
+        for name in tags[0] if tags else ():
+            values = [t.get(name) for t in tags]
+            if None not in values and len(set(values)) == len(values):
+                return name, MappingProxyType(dict(zip(values, self.subclasses)))
+        return None, MappingProxyType({})
 
     @staticmethod
-    def get_typing(*args: Argument):
-        return {
+    def get_typing(*args: Argument) -> FrozenSet[str]:
+        return frozenset(
             tp
             for a in args
             for tp, val in {
@@ -175,42 +219,6 @@ class Component:
                 "List": a.array,
             }.items()
             if val
-        }
-
-    @property
-    @lru_cache()
-    def is_adjusted(self):
-        if self.api:
-            if self.is_path:
-                return self in self.api.adjusted_paths
-            elif self.is_object:
-                return self in self.api.adjusted_objects
-
-    @property
-    @lru_cache()
-    def is_aliased(self):
-        if self.is_object:
-            return self in self.api.aliased_objects
-
-    @property
-    @lru_cache()
-    def adjusted_objects(self):
-        return [o for o in self.args_objects if o.is_adjusted]
-
-    @property
-    @lru_cache()
-    def adjusted_typing(self):
-        return self.get_typing(*{
-            a for a in self.args if any([c.is_adjusted for c in a.com_types])
-        })
-
-    @property
-    @lru_cache()
-    def is_prepared(self):
-        return self.is_path and (
-                self.api.input_file in self.used_objects or
-                self.name == "sendMediaGroup" or
-                any([a.name in const.PRESETS for a in self.args])
         )
 
     def __hash__(self):
@@ -228,7 +236,7 @@ class Component:
 class Header:
     name: str
     anchor: str
-    tag: Tag
+    tag: Optional[Tag] = None
     components: List[Component] = field(default_factory=list)
 
     @property
@@ -243,79 +251,92 @@ class Header:
         return hash(self.name)
 
 
+@slots
 @dc
-class Api:
+class Api(Final):
     version: str
     headers: List[Header]
 
-    def get_by_name(self, name: str) -> Component:
-        for h in self.headers:
-            for c in h.components:
-                if c.name == name:
-                    return c
+    by_name: Mapping[str, Component] = derived()
+    by_anchor: Mapping[str, Component] = derived()
+    by_category: Mapping[CategoryType, Tuple[Component, ...]] = derived()
+    used_by: Mapping[Component, Tuple[Component, ...]] = derived()
+    aliased_by: Mapping[Component, Tuple[Component, ...]] = derived()
+    graph: Graph = derived()
+    paths: Tuple[Component, ...] = derived()
+    objects: Tuple[Component, ...] = derived()
+    paths_objects: Tuple[Component, ...] = derived()
+    all_results_objects: Tuple[Component, ...] = derived()
+    aliased_objects: FrozenSet[Component] = derived()
+    adjusted_objects: FrozenSet[Component] = derived()
+    adjusted_paths: FrozenSet[Component] = derived()
+    input_file: Optional[Component] = derived()
+    update: Optional[Component] = derived()
+
+    def index(self) -> Api:
+        """
+        Index components by name, anchor and category
+        and objects by paths using them, in order of page
+
+        Parser resolves types through the indexes before :meth:`finalize` builds them again.
+        """
+        components = [c for h in self.headers for c in h.components]
+        self.by_name = MappingProxyType({c.name: c for c in components})
+        self.by_anchor = MappingProxyType({c.anchor: c for c in components})
+        self.by_category = MappingProxyType({
+            ct: tuple(c for c in components if c.category == ct)
+            for ct in CategoryType
+        })
+        self.paths = self.by_category[CategoryType.PATH]
+        self.objects = self.by_category[CategoryType.OBJECT]
+        used_by: Dict[Component, List[Component]] = {o: [] for o in self.objects}
+        for p in self.paths:
+            for o in dict.fromkeys(t for a in (*p.args, p.result) for t in a.com_types):
+                used_by.setdefault(o, []).append(p)
+        self.used_by = MappingProxyType({o: tuple(ps) for o, ps in used_by.items()})
+        return self
+
+    def finalize(self) -> Api:
+        """
+        Compute derived attributes of api, components and arguments once
+        and make them read-only
+        """
+        components = [c for h in self.headers for c in h.components]
+        for c in components:
+            c.api = self
+            c.derive()
+
+        self.index()
+        self.aliased_by = MappingProxyType({
+            self.by_name[name]: tuple(
+                self.by_name[path] for path in paths if path in self.by_name
+            )
+            for name, paths in const.ALIASED_OBJECTS.items() if name in self.by_name
+        })
+        self.graph = Graph(components)
+        self.paths_objects = tuple(
+            sorted({o for p in self.paths for o in p.used_objects}, key=str)
+        )
+        self.all_results_objects = tuple(sorted(
+            {o for p in self.paths for o in p.result_objects}, key=str
+        ))
+        self.aliased_objects = frozenset(self.aliased_by)
+        self.adjusted_objects = self.graph.adjusted(self.all_results_objects, self.aliased_objects)
+        self.adjusted_paths = frozenset(
+            p for p in self.paths
+            if any([o in self.adjusted_objects for o in p.result_objects])
+        )
+        self.input_file = self.by_name.get("InputFile")
+        self.update = self.by_name.get("Update")
 
-    @property
-    @lru_cache()
-    def paths(self):
-        return [c for h in self.headers for c in h.components if c.is_path]
+        for c in components:
+            c.relate()
+        for c in components:
+            c.relate_adjusted().freeze()
+        return self.freeze()
 
-    @property
-    @lru_cache()
-    def objects(self):
-        return [c for h in self.headers for c in h.components if c.is_object]
+    def get_by_name(self, name: str) -> Optional[Component]:
+        return self.by_name.get(name)
 
     def __hash__(self):
         return hash(self.version)
-
-    @property
-    @lru_cache()
-    def paths_objects(self):
-        return sorted({o for p in self.paths for o in p.used_objects}, key=str)
-
-    @property
-    @lru_cache()
-    def all_results_objects(self):
-        return sorted({o for p in self.paths for o in p.result_objects}, key=str)
-
-    @property
-    @lru_cache()
-    def aliased_objects(self):
-        return [o for o in self.objects if o.name in const.ALIASED_OBJECTS.keys()]
-
-    @property
-    @lru_cache()
-    def adjusted_objects(self):
-        _adjusted_objects = set()
-
-        def is_adjusted(c: Component):
-            if c in self.aliased_objects or c in _adjusted_objects:
-                _adjusted_objects.add(c)
-                return True
-            for o in c.used_objects:
-                if is_adjusted(o):
-                    _adjusted_objects.add(c)
-
-        [is_adjusted(c) for c in self.all_results_objects]
-        return _adjusted_objects
-
-    @property
-    @lru_cache()
-    def adjusted_paths(self):
-        return {p
-                for p in self.paths
-                if any([o in self.adjusted_objects for o in p.result_objects])
-                }
-
-    @property
-    @lru_cache()
-    def input_file(self):
-        for o in self.objects:
-            if o.name == "InputFile":
-                return o
-
-    @property
-    @lru_cache()
-    def update(self):
-        for o in self.objects:
-            if o.name == "Update":
-                return o
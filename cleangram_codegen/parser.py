@@ -1,17 +1,82 @@
+from __future__ import annotations
+
+import pathlib
 import re
-from typing import Dict, List, Optional
+from dataclasses import dataclass as dc
+from dataclasses import field
+from typing import Dict, List, Optional, Tuple
 
 import h11
 import httpx
 from bs4 import BeautifulSoup, Tag
 
-from . import comps, const
+from . import cache, comps, const
+from .enums import BackendType
 from .models import Api, Argument, Component, Header
+from .profiler import Profiler, measure
+
+API_URL = "https://core.telegram.org/bots/api"
+
+CONTENT_START = re.compile(r"<div\b[^>]*\bid=[\"']dev_page_content[\"'][^>]*>", re.I)
+DIV_TAG = re.compile(r"<(/?)div\b[^>]*>", re.I)
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+def get_html(spec_file: Optional[pathlib.Path] = None) -> str:
+    if spec_file:
+        return spec_file.read_text(encoding="utf-8")
+    return httpx.get(API_URL).text
+
+
+def slice_content(html: str) -> str:
+    """
+    Cut ``div#dev_page_content`` out of **html** without building the page
+
+    :param html:
+    :return: whole **html** if content div was not found
+    """
+    if not (start := CONTENT_START.search(html)):
+        return html
+    depth = 1
+    for tag in DIV_TAG.finditer(html, start.end()):
+        depth += -1 if tag.group(1) else 1
+        if not depth:
+            return html[start.start():tag.end()]
+    return html
 
 
-def get_content() -> Tag:
-    html = httpx.get("https://core.telegram.org/bots/api").text
-    soup = BeautifulSoup(html, features="html.parser")
+def resolve(backend: BackendType) -> BackendType:
+    """
+    Tree builder **backend** stands for, ``auto`` is lxml if installed
+
+    Every backend builds the same :class:`Api`, ``bench`` checks it by serialized output.
+    """
+    if backend == BackendType.AUTO:
+        return BackendType.LXML if HAS_LXML else BackendType.HTML_PARSER
+    return backend
+
+
+def get_content(html: str, backend: BackendType = BackendType.AUTO) -> Tag:
+    """
+    Build tree of ``div#dev_page_content``
+
+    :param html:
+    :param backend: ``auto`` is lxml if installed and ``html.parser`` otherwise,
+        ``stream`` slices the content div and builds it with lxml if installed
+    :return:
+    """
+    backend = resolve(backend)
+    if backend == BackendType.STREAM:
+        features = "lxml" if HAS_LXML else "html.parser"
+        html = slice_content(html)
+    else:
+        features = backend.value
+    soup = BeautifulSoup(html, features=features)
     return soup.find("div", id="dev_page_content")
 
 
@@ -21,15 +86,59 @@ def parse_version(content: Tag) -> str:
     )
 
 
-def parse_args(component: Component, anchors: Dict[str, Component]):
-    table = None
-    for sub in component.tag.next_siblings:  # type: Tag
-        if sub.name:
-            if sub.name == "table":
-                table = sub
-                break
-            elif sub.name == "h4":
-                return
+@dc
+class Section:
+    """
+    Content between header **tag** and the next header
+    """
+    tag: Tag
+    paragraphs: List[Tag] = field(default_factory=list)
+    table: Optional[Tag] = None
+    ul: Optional[Tag] = None
+    sections: List[Section] = field(default_factory=list)
+
+
+def index_sections(content: Tag) -> List[Section]:
+    """
+    Split page content into h3 sections of h4 sections in a single pass
+
+    Paragraphs and table of h4 section run until the next h4,
+    list of subclasses ends at the next h3 as well.
+
+    :param content:
+    :return:
+    """
+    h3s: List[Section] = []
+    h4: Optional[Section] = None
+    closed: bool = False
+    for sub in content.children:  # type: Tag
+        if not sub.name:
+            continue
+        if sub.name == "h3":
+            h3s.append(Section(tag=sub))
+            closed = True
+        elif sub.name == "h4":
+            h4 = Section(tag=sub)
+            closed = False
+            if h3s:
+                h3s[-1].sections.append(h4)
+        elif h4:
+            if sub.name == "p":
+                if sub.text:
+                    h4.paragraphs.append(sub)
+            elif sub.name == "table":
+                if h4.table is None:
+                    h4.table = sub
+            elif sub.name == "ul":
+                if h4.ul is None and not closed:
+                    h4.ul = sub
+    return h3s
+
+
+def parse_args(component: Component, section: Section, api: Api):
+    table = section.table
+    if table is None:
+        return
 
     # is table has 3 columns
     three: bool = len(table.thead.find_all("th")) == 3
@@ -41,11 +150,13 @@ def parse_args(component: Component, anchors: Dict[str, Component]):
         optional = "Optional" in td[2].text
         arg = Argument(
             name=td[0].text,
-            desc=desc,
+            desc=desc.text,
             array=td[1].text.count("rray of"),
             optional=optional,
-            std_types=list({v for k, v in const.STD_TYPES.items() if k in td[1].text}),
-            com_types=[anchors[tag["href"]] for tag in td[1].findAll("a")],
+            std_types=list(dict.fromkeys(
+                v for k, v in const.STD_TYPES.items() if k in td[1].text
+            )),
+            com_types=[api.by_anchor[tag["href"]] for tag in td[1].findAll("a")],
             default=(
                 em.text
                 if ((em := desc.find("em")) and not optional and "must be" in desc.text)
@@ -53,24 +164,23 @@ def parse_args(component: Component, anchors: Dict[str, Component]):
             ),
             component=component,
         )
-        if "Field" in arg.field_value:
-            component.has_field = True
         component.args.append(arg)
     component.args.sort(key=lambda c: c.optional)
     component.args.sort(key=lambda c: bool(c.default))
 
 
-def parse_result(component: Component, anchors: Dict[str, Component]):
+def parse_result(component: Component, section: Section, api: Api):
     result = component.result
 
-    for p in component.desc:
+    for p in section.paragraphs:
         links = [i for i in p.find_all("a") if i["href"].startswith("#")]
         for phrase in p.text.replace(",", ".").split("."):
             if "eturn" in phrase:
                 words = phrase.split()
                 for link in links:
                     if link.text in words and p.text[0].isupper():
-                        if anc := anchors.get(link["href"], None):
+                        anc = api.by_anchor.get(link["href"])
+                        if anc and anc.is_object:
                             result.com_types.append(anc)
                 for alias, tp in const.STD_TYPES.items():
                     if alias in words:
@@ -79,95 +189,120 @@ def parse_result(component: Component, anchors: Dict[str, Component]):
                     result.array = phrase.count("rray of")
 
 
-def parse_component(tag: Tag) -> Component:
-    component = Component(
+def parse_component(section: Section) -> Component:
+    tag = section.tag
+    return Component(
         name=tag.text,
         anchor=tag.a["href"],
         tag=tag,
         parent=comps.TELEGRAM_OBJECT if tag.text[0].isupper() else comps.TELEGRAM_PATH,
+        desc=[p.text for p in section.paragraphs],
     )
-    for sub in tag.next_siblings:  # type: Tag
-        if sub.name and sub.text:
-            if sub.name == "h4":
-                break
-            if sub.name == "p":
-                component.desc.append(sub)
-    return component
 
 
-def parse_components(header: Tag) -> List[Component]:
-    _comps = []
-    for sub in header.next_siblings:  # type: Tag
-        if sub.name == "h4" and " " not in sub.text:
-            _comps.append(parse_component(sub))
-        if sub.name == "h3":
-            break
-    return _comps
+def parse_components(header: Section) -> List[Tuple[Component, Section]]:
+    return [
+        (parse_component(sub), sub)
+        for sub in header.sections
+        if " " not in sub.tag.text
+    ]
 
 
-def parse_subclasses(component: Component, anchors: Dict[str, Component]):
-    ul: Optional[Tag] = None
-    for sub in component.tag.next_siblings:  # type: Tag
-        if sub.name:
-            if sub.name in {"h4", "h3"}:
-                return
-            elif sub.name == "ul":
-                ul = sub
-                break
-    if ul:
-        for li in ul.find_all("li"):
-            sub_class = anchors[li.a["href"]]
+def parse_subclasses(component: Component, section: Section, api: Api):
+    if section.ul:
+        for li in section.ul.find_all("li"):
+            sub_class = api.by_anchor[li.a["href"]]
             sub_class.parent = component
             component.subclasses.append(sub_class)
 
 
 def process_input_media(api: Api):
-    for h in api.headers:
-        for c in h.components:
-            if c.name.startswith("InputMedia"):
-                for a in c.args:
-                    if a.name == "media":
-                        a.com_types.append(api.get_by_name("InputFile"))
-            elif c.name == "sendMediaGroup":
-                for a in c.args:
-                    if a.name == "media":
-                        a.com_types = [api.get_by_name("InputMedia")]
+    """
+    Media of every kind of :class:`InputMedia` is uploaded as file as well,
+    paths taking kinds of media take any :class:`InputMedia`
+    """
+    input_media = api.by_name.get("InputMedia")
+    if input_media is None:
+        return
+    paths: Dict[Component, None] = {}
+    for c in (input_media, *input_media.subclasses):
+        for a in c.args:
+            if a.name == "media":
+                a.com_types.append(api.by_name["InputFile"])
+        paths.update(dict.fromkeys(api.used_by.get(c, ())))
+    for path in paths:
+        for a in path.args:
+            if a.name == "media":
+                a.com_types = [input_media]
+    api.index()
 
 
-def parse_headers(content: Tag) -> List[Header]:
-    # Parsing headers
+def parse_api(content: Tag) -> Api:
+    """
+    Build :class:`Api` of page content, types are resolved through its indexes
+    """
     is_start: bool = False
     headers: List[Header] = []
-    for h3 in content.find_all("h3"):
-        if h3.text == "Getting updates":
+    sections: List[Tuple[Component, Section]] = []
+    for h3 in index_sections(content):
+        if h3.tag.text == "Getting updates":
             is_start = True
         if is_start:
+            components = parse_components(h3)
+            sections.extend(components)
             headers.append(
                 Header(
-                    name=h3.text,
-                    anchor=h3.a["href"],
-                    tag=h3,
-                    components=parse_components(h3),
+                    name=h3.tag.text,
+                    anchor=h3.tag.a["href"],
+                    tag=h3.tag,
+                    components=[c for c, _ in components],
                 )
             )
-    # crete dict of objects {"#update": Component(name="Update"), ...}
-    anchors: Dict[str, Component] = {
-        c.anchor: c for h in headers for c in h.components if c.is_object
-    }
-    for h in headers:
-        for c in h.components:
-            parse_args(c, anchors)
-            parse_subclasses(c, anchors)
-            if c.is_path:
-                parse_result(c, anchors)
-    return headers
-
-
-def get_api() -> Api:
-    content = get_content()
-    api = Api(version=parse_version(content), headers=parse_headers(content))
-    process_input_media(api)
-    for h in api.headers:
-        for c in h.components:
-            c.api = api
-    return api
+    api = Api(version=parse_version(content), headers=headers).index()
+    for c, section in sections:
+        parse_args(c, section, api)
+        parse_subclasses(c, section, api)
+        if c.is_path:
+            parse_result(c, section, api)
+    return api.index()
+
+
+def parse_headers(content: Tag) -> List[Header]:
+    return parse_api(content).headers
+
+
+def get_api(
+        spec_file: Optional[pathlib.Path] = None,
+        cache_dir: Optional[pathlib.Path] = cache.CACHE_DIR,
+        backend: BackendType = BackendType.AUTO,
+        profiler: Optional[Profiler] = None,
+) -> Api:
+    """
+    Build :class:`Api` from the Bot API page
+
+    :param spec_file: saved HTML snapshot, fetched from :data:`API_URL` if omitted
+    :param cache_dir: directory of parsed snapshots, ``None`` disables the cache
+    :param backend: HTML tree builder
+    :param profiler: measures every step
+    :return:
+    """
+    backend = resolve(backend)
+    with measure(profiler, "get_html"):
+        html = get_html(spec_file)
+    if cache_dir:
+        with measure(profiler, "cache_load"):
+            api = cache.load(html, cache_dir, backend)
+        if api:
+            with measure(profiler, "finalize"):
+                return api.finalize()
+    with measure(profiler, "get_content"):
+        content = get_content(html, backend)
+    with measure(profiler, "parse_headers"):
+        api = parse_api(content)
+    with measure(profiler, "process_input_media"):
+        process_input_media(api)
+    if cache_dir:
+        with measure(profiler, "cache_save"):
+            cache.save(html, api, cache_dir, backend)
+    with measure(profiler, "finalize"):
+        return api.finalize()
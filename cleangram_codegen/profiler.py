@@ -0,0 +1,100 @@
+import cProfile
+import pathlib
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass as dc
+from typing import ContextManager, Iterator, List, Optional
+
+
+@dc
+class Record:
+    phase: str
+    package: Optional[str] = None
+    component: Optional[str] = None
+    template: Optional[str] = None
+    seconds: float = 0
+    allocated: int = 0
+    peak: int = 0
+
+    def __str__(self):
+        return "/".join(filter(None, [self.phase, self.package, self.component, self.template]))
+
+
+class Profiler:
+    """
+    Wall time and memory of pipeline phases
+
+    Memory is traced with :mod:`tracemalloc`:
+    **allocated** is memory still held after the block,
+    **peak** is the highest usage inside the block over the usage before it.
+    """
+
+    def __init__(self, cprofile: Optional[pathlib.Path] = None):
+        """
+        :param cprofile: file of :mod:`cProfile` stats of the whole run
+        """
+        self.records: List[Record] = []
+        self.cprofile = cprofile
+        self._profile: Optional[cProfile.Profile] = None
+        self._tracing = False
+        # usage before every open block and the highest usage seen inside it
+        self._stack: List[List[int]] = []
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self.cprofile)
+            self._profile = None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    @contextmanager
+    def measure(self, phase: str, **labels: Optional[str]) -> Iterator[Record]:
+        record = Record(phase, **labels)
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            before, highest = self._stack.pop()
+            current, peak = tracemalloc.get_traced_memory()
+            highest = max(highest, peak)
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], highest)
+            record.allocated = current - before
+            record.peak = highest - before
+            self.records.append(record)
+
+    def top(self, n: int = 20) -> List[Record]:
+        return sorted(self.records, key=lambda r: r.seconds, reverse=True)[:n]
+
+    def report(self, n: int = 20) -> str:
+        lines = [f"{'seconds':>10} {'allocated':>12} {'peak':>12}  record"]
+        for r in self.top(n):
+            lines.append(f"{r.seconds:>10.4f} {r.allocated:>12} {r.peak:>12}  {r}")
+        return "\n".join(lines)
+
+
+def measure(profiler: Optional[Profiler], phase: str, **labels: Optional[str]) -> ContextManager:
+    """
+    :meth:`Profiler.measure` of **profiler**, does nothing without it
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(phase, **labels)
@@ -0,0 +1,194 @@
+import abc
+import io
+import logging
+import os
+import pathlib
+import sys
+import tarfile
+import time
+import zipfile
+from typing import BinaryIO, Dict, Optional
+
+from .enums import OutputType
+
+log = logging.getLogger("Generator")
+
+
+class Sink(abc.ABC):
+    """
+    Destination of generated files
+
+    Paths are relative to the output root, like ``cleangram/core/bot/bot.py``.
+    """
+
+    #: keeps files between runs, so they can be read back and removed
+    persistent: bool = False
+
+    @abc.abstractmethod
+    def write(self, path: pathlib.PurePath, txt: str): ...
+
+    def read(self, path: pathlib.PurePath) -> Optional[str]:
+        return None
+
+    def exists(self, path: pathlib.PurePath) -> bool:
+        return False
+
+    def remove(self, path: pathlib.PurePath): ...
+
+    def close(self): ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class DirSink(Sink):
+    """
+    Write files under **root**, files with unchanged content are not touched
+    """
+    persistent = True
+
+    def __init__(self, root: pathlib.Path):
+        self.root = root
+
+    def write(self, path: pathlib.PurePath, txt: str):
+        full = self.root / path
+        if full.is_file() and full.read_text(encoding="utf-8") == txt:
+            log.debug(f"{path} unchanged")
+            return
+        os.makedirs(full.parent, exist_ok=True)
+        with open(full, "w", encoding="utf-8") as f:
+            f.write(txt)
+        log.info(str(path))
+
+    def read(self, path: pathlib.PurePath) -> Optional[str]:
+        try:
+            return (self.root / path).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def exists(self, path: pathlib.PurePath) -> bool:
+        return (self.root / path).exists()
+
+    def remove(self, path: pathlib.PurePath):
+        full = self.root / path
+        if full.is_file():
+            full.unlink()
+            log.info(f"{path} removed")
+
+
+class LogSink(Sink):
+    """
+    Log every file with its content
+    """
+
+    def write(self, path: pathlib.PurePath, txt: str):
+        log.info(f"{path}\n{txt}")
+
+
+class MemorySink(Sink):
+    """
+    Keep files in :attr:`files` by posix path, see :func:`.importer.mount`
+    """
+    persistent = True
+
+    def __init__(self):
+        self.files: Dict[str, str] = {}
+
+    def write(self, path: pathlib.PurePath, txt: str):
+        self.files[path.as_posix()] = txt
+        log.debug(str(path))
+
+    def read(self, path: pathlib.PurePath) -> Optional[str]:
+        return self.files.get(path.as_posix())
+
+    def exists(self, path: pathlib.PurePath) -> bool:
+        return path.as_posix() in self.files
+
+    def remove(self, path: pathlib.PurePath):
+        self.files.pop(path.as_posix(), None)
+
+
+class ArchiveSink(Sink, abc.ABC):
+    """
+    Stream files into archive written to **fp**
+
+    :param fp: may be unseekable, like stdout
+    :param owned: close **fp** with sink
+    """
+
+    def __init__(self, fp: BinaryIO, owned: bool = False):
+        self.fp = fp
+        self.owned = owned
+
+    def close(self):
+        if self.owned:
+            self.fp.close()
+        else:
+            self.fp.flush()
+
+
+class TarSink(ArchiveSink):
+    """
+    Stream files into tar archive, gzipped if **compress**
+    """
+
+    def __init__(self, fp: BinaryIO, owned: bool = False, compress: bool = False):
+        super(TarSink, self).__init__(fp, owned)
+        self.tar = tarfile.open(fileobj=fp, mode="w|gz" if compress else "w|")
+        self.mtime = time.time()
+
+    def write(self, path: pathlib.PurePath, txt: str):
+        data = txt.encode("utf-8")
+        info = tarfile.TarInfo(path.as_posix())
+        info.size = len(data)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self.tar.addfile(info, io.BytesIO(data))
+        log.info(str(path))
+
+    def close(self):
+        self.tar.close()
+        super(TarSink, self).close()
+
+
+class ZipSink(ArchiveSink):
+    """
+    Stream files into zip archive
+    """
+
+    def __init__(self, fp: BinaryIO, owned: bool = False):
+        super(ZipSink, self).__init__(fp, owned)
+        self.zip = zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_DEFLATED)
+        self.date_time = time.localtime()[:6]
+
+    def write(self, path: pathlib.PurePath, txt: str):
+        info = zipfile.ZipInfo(path.as_posix(), date_time=self.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        self.zip.writestr(info, txt.encode("utf-8"))
+        log.info(str(path))
+
+    def close(self):
+        self.zip.close()
+        super(ZipSink, self).close()
+
+
+def open_sink(output_type: OutputType, output: Optional[pathlib.Path] = None) -> Sink:
+    """
+    Create sink of **output_type**
+
+    :param output_type:
+    :param output: directory or archive file, current directory or stdout if omitted
+    :return:
+    """
+    if output_type == OutputType.DIR:
+        return DirSink(output or pathlib.Path())
+    if output_type == OutputType.LOG:
+        return LogSink()
+
+    fp: BinaryIO = open(output, "wb") if output else sys.stdout.buffer
+    if output_type == OutputType.ZIP:
+        return ZipSink(fp, owned=bool(output))
+    return TarSink(fp, owned=bool(output), compress=output_type == OutputType.TGZ)
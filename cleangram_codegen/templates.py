@@ -1,13 +1,15 @@
 import abc
 from dataclasses import dataclass as dc, field
 from textwrap import wrap
-from typing import Literal, List, Set
+from typing import Dict, Iterable, Literal, List, Optional, Set, Tuple
 
 from . import comps, const
 from .comps import TELEGRAM_PATH, TELEGRAM_OBJECT
 from .enums import PackageType, CategoryType
 from .models import Api, Component
 
+SECTIONS = ("import", "declaration", "arguments", "methods")
+
 
 @dc
 class Template(abc.ABC):
@@ -31,13 +33,17 @@ __bot_api__ = "{self.api.version}"
 @dc
 class PackageTemplate(Template):
     package: PackageType
-    import_section: str = ""
-    declaration_section: str = ""
-    arguments_section: str = ""
-    methods_section: str = ""
+    sections: Dict[str, List[str]] = field(
+        default_factory=lambda: {var: [] for var in SECTIONS}
+    )
     typing_imports: List[str] = field(default_factory=list)
     object_imports: List[Component] = field(default_factory=list)
     type_checking_imports: List[Component] = field(default_factory=list)
+    bundled: bool = False
+    bind_context: bool = False
+    slots: bool = False
+    direct: bool = False
+    shared_pool: bool = False
 
     def __call__(
             self,
@@ -51,9 +57,12 @@ class PackageTemplate(Template):
             tc: int,
             nl: int = 0
     ):
-        section: str = getattr(self, f"{var}_section")
-        new_val = section + (tc * '\t') + val + (nl * '\n')
-        setattr(self, f"{var}_section", new_val)
+        section = self.sections[var]
+        if tc:
+            section.append(tc * '\t')
+        section.append(val)
+        if nl:
+            section.append(nl * '\n')
 
     def i(self, val: str = "", tc=0, nl=1):
         self("import", val, tc, nl)
@@ -67,39 +76,72 @@ class PackageTemplate(Template):
     def m(self, val: str = "", tc=1, nl=1):
         self("methods", val, tc, nl)
 
-    def __str__(self):
+    def finish(self):
+        """
+        Emit collected imports, once
+        """
+        if self.finished:
+            return
+        self.finished = True
+
+        self.object_imports = [o for o in self.object_imports if not self.is_bundled(o)]
+        self.type_checking_imports = [
+            o for o in self.type_checking_imports if not self.is_bundled(o)
+        ]
         if self.type_checking_imports:
             self.typing_imports.append("TYPE_CHECKING")
 
         if self.typing_imports:
-            for tp in self.typing_imports:
+            for tp in dict.fromkeys(self.typing_imports):
                 self.i(f"from typing import {tp}")
 
-        for obj in self.object_imports:
+        for obj in dict.fromkeys(self.object_imports):
             self.write_import(obj)
 
         if self.type_checking_imports:
             self.i("if TYPE_CHECKING:")
-            for obj in self.type_checking_imports:
+            for obj in dict.fromkeys(self.type_checking_imports):
                 self.write_import(obj, tc=1)
 
+    def __str__(self):
+        self.finish()
         return "\n".join([
-            self.import_section,
-            self.declaration_section,
-            self.arguments_section,
-            self.methods_section
+            "".join(self.sections[var]) for var in SECTIONS
         ]).replace("\t", "    ")
 
     def __post_init__(self):
+        self.finished = False
         self.is_core = self.package == PackageType.CORE
         self.is_aio = self.package == PackageType.AIO
         self.is_sync = self.package == PackageType.SYNC
         self.await_ = "await " if self.is_aio else ""
         self.async_ = "async " if self.is_aio else ""
 
+    @property
+    def category(self) -> Optional[CategoryType]:
+        """
+        Category of components declared by template
+        """
+        return None
+
+    def is_bundled(self, obj: Component) -> bool:
+        """
+        Whether **obj** is declared in the same bundled module
+        """
+        return (
+            self.bundled and
+            obj.category == self.category and
+            (self.is_core or obj.is_adjusted) and
+            self.api.by_name.get(obj.name) is obj
+        )
+
     def write_import(self, *objects: Component, tc: int = 0):
         for obj in objects:
-            if self.is_core or obj.is_adjusted:
+            if self.is_bundled(obj):
+                continue
+            if self.category and obj.category != self.category:
+                self.i(f"from ..{obj.category.value} import {obj.camel}", tc=tc)
+            elif self.is_core or obj.is_adjusted:
                 self.i(f"from .{obj.module} import {obj.camel}", tc=tc)
             else:
                 self.i(f"from ...core import {obj.camel}", tc=tc)
@@ -109,6 +151,10 @@ class PackageTemplate(Template):
 class ComponentTemplate(PackageTemplate, abc.ABC):
     com: Component = None
 
+    @property
+    def category(self) -> Optional[CategoryType]:
+        return self.com.category
+
     def header(self): ...
 
     @abc.abstractmethod
@@ -117,7 +163,7 @@ class ComponentTemplate(PackageTemplate, abc.ABC):
     def description(self):
         self.a('"' * 3)
         for p in self.com.desc:
-            for pp in wrap(p.text):
+            for pp in wrap(p):
                 self.a(pp)
             if self.is_core and self.com.subclasses:
                 self.a()
@@ -127,14 +173,21 @@ class ComponentTemplate(PackageTemplate, abc.ABC):
         self.a(f"Reference: https://core.telegram.org/bots/api{self.com.anchor}")
         self.a('"' * 3)
 
+    @property
+    def slotted(self) -> bool:
+        """
+        Fields are kept in ``__slots__`` instead of pydantic model
+        """
+        return False
+
     def arguments(self):
         if self.is_core:
-            if self.com.has_field:
+            if self.com.has_field and not self.slotted:
                 self.i("from pydantic import Field")
             for arg in self.com.args:
-                self.a(f"{arg.field}: {arg.annotation}{arg.field_value}")
+                self.a(f"{arg.field}: {arg.annotation}{'' if self.slotted else arg.field_value}")
                 if arg.desc:
-                    desc = '\n\t'.join(wrap(arg.desc.text))
+                    desc = '\n\t'.join(wrap(arg.desc))
                     self.a(f'"""{desc}"""\n')
 
     @abc.abstractmethod
@@ -154,6 +207,10 @@ class ComponentTemplate(PackageTemplate, abc.ABC):
 
 @dc
 class ObjectTemplate(ComponentTemplate):
+    @property
+    def slotted(self) -> bool:
+        return self.slots
+
     def header(self):
         super(ObjectTemplate, self).header()
         if self.is_core:
@@ -162,9 +219,12 @@ class ObjectTemplate(ComponentTemplate):
     def declaration(self):
         extends = []
         if self.is_core:
-            self.object_imports.append(self.com.parent)
+            parent = self.com.parent
+            if self.slots and parent == TELEGRAM_OBJECT:
+                parent = comps.SLOTS_OBJECT
+            self.object_imports.append(parent)
             # self.i(f"from .{self.com.parent.module} import {self.com.parent.camel}")
-            extends.append(self.com.parent.camel)
+            extends.append(parent.camel)
             if self.com.is_adjusted:
                 self.i("import abc")
                 extends.append("abc.ABC")
@@ -192,19 +252,89 @@ class ObjectTemplate(ComponentTemplate):
             # for tp in self.com.adjusted_objects:
             #     self.i(f"from .{tp.module} import {tp.camel}", 1)
             if self.com.is_aliased:
-                for path in self.api.paths:
-                    if path.name in const.ALIASED_OBJECTS[self.com.name]:
-                        self.type_checking_imports.extend(path.used_objects)
-                        # for c in path.used_objects:
-                        #     if c == self.com:
-                        #         continue
-                        #     if c.is_adjusted:
-                        #         self.i(f"from .{c.module} import {c.camel}", 1)
-                        #     else:
-                        #         self.i(f"from ...core import {c.camel}", 1)
+                for path in self.com.aliased_paths:
+                    self.type_checking_imports.extend(path.used_objects)
+                    # for c in path.used_objects:
+                    #     if c == self.com:
+                    #         continue
+                    #     if c.is_adjusted:
+                    #         self.i(f"from .{c.module} import {c.camel}", 1)
+                    #     else:
+                    #         self.i(f"from ...core import {c.camel}", 1)
             for arg in self.com.args:
                 if any([o.is_adjusted for o in arg.com_types]):
-                    self.a(f"{arg}:{arg.annotation}{arg.field_value}")
+                    self.a(f"{arg}:{arg.annotation}{'' if self.slots else arg.field_value}")
+        if self.slots:
+            self.slots_declaration()
+
+    def slots_declaration(self):
+        """
+        Declare ``__slots__``, keys of fields, object fields and constructor
+        """
+        if not self.is_core:
+            self.a("__slots__ = ()")
+            return
+        inherited = {a.name for a in self.com.parent.args} if self.com.parent else set()
+        slots = [a.field for a in self.com.args if a.name not in inherited]
+        if self.com.name == "Update":
+            slots.append("_event_type")
+        if self.com.is_aliased:
+            slots.append("_bot")
+        self.a(f"__slots__ = {tuple(slots)!r}")
+        self.a(f"__fields__ = {tuple((a.field, a.name) for a in self.com.args)!r}")
+        self.a("__objects__ = {")
+        for a in self.com.args:
+            if a.com_types:
+                self.a(f"{a.field!r}: ({tuple(t.camel for t in a.com_types)!r}, {a.array}),", 2)
+        self.a("}")
+        if self.com.args:
+            defaults = {}
+            for a in self.com.args:
+                if a.default:
+                    defaults[a.field] = a.default
+                elif a.array and a.component and a.component.is_object:
+                    defaults[a.field] = []
+                elif a.optional:
+                    defaults[a.field] = None
+            required = tuple(a.name for a in self.com.args if a.field not in defaults)
+            self.a(f"__required__ = {required!r}")
+            self.a("__defaults__ = {")
+            for attr, default in defaults.items():
+                self.a(f"{attr!r}: {default!r},", 2)
+            self.a("}")
+        if self.com.discriminator:
+            variants = {value: sub.camel for value, sub in self.com.variants.items()}
+            self.a(f"__variants__ = ({self.com.discriminator!r}, {variants!r})")
+        if not self.com.args:
+            return
+
+        signature = ["self", "*"]
+        body = []
+        for a in self.com.args:
+            value = a.field
+            if a.default:
+                default = f" = {a.default!r}"
+            elif a.array and a.component and a.component.is_object:
+                default = " = None"
+                value = f"[] if {a} is None else {a}"
+            elif a.optional:
+                default = " = None"
+            else:
+                default = ""
+            signature.append(f"{a}: {a.annotation}{default}")
+            body.append(f"self.{a} = {value}")
+        self.a(f"def __init__({','.join(signature)}):")
+        for line in body:
+            self.a(line, 2)
+        if self.com.is_aliased:
+            self.a("self._bot = Bot.current()", 2)
+        if self.com.name == "Update":
+            self.a("self._event_type = None", 2)
+            self.a(f"for name in {tuple(a.field for a in self.com.args[1:])!r}:", 2)
+            self.a("value = getattr(self, name)", 3)
+            self.a("if value is not None:", 3)
+            self.a("self._event_type = value, name", 4)
+            self.a("break", 4)
 
     def methods(self):
         if self.com.is_aliased:
@@ -213,15 +343,24 @@ class ObjectTemplate(ComponentTemplate):
             self.adjusts()
 
             if self.com.name == "Update":
-                self.i("from functools import lru_cache")
                 self.typing_imports.append("Tuple")
+                if not self.slots:
+                    self.i("from pydantic import PrivateAttr")
+                    self.typing_imports.extend(["Any", "Optional"])
+                    self.m("_event_type: Optional[Tuple[TelegramObject, str]] = PrivateAttr(None)")
+                    self.m("def __init__(self, **data: Any):")
+                    self.m("super(Update, self).__init__(**data)", 2)
+                    self.m(f"for name in {tuple(e.name for e in self.com.args[1:])!r}:", 2)
+                    self.m("if data.get(name) is not None:", 3)
+                    self.m("self._event_type = getattr(self, name), name", 4)
+                    self.m("break", 4)
+
                 self.m("def __hash__(self): return hash(self.update_id)")
 
-                self.m("@lru_cache()")
                 self.m("def get_event_type(self) -> Tuple[TelegramObject, str]:")
-                for e in self.com.args[1:]:
-                    self.m(f"\tif self.{e.name}: return self.{e.name}, '{e.name}'")
-                self.m("\traise NameError(\"Event Not Found\")")
+                self.m("if self._event_type is None:", 2)
+                self.m("raise NameError(\"Event Not Found\")", 3)
+                self.m("return self._event_type", 2)
 
                 self.m("@property")
                 self.m("def event(self) -> TelegramObject: return self.event_type[0]")
@@ -230,12 +369,12 @@ class ObjectTemplate(ComponentTemplate):
 
     def alias(self):
         if self.com.is_adjusted:
-            for path in self.api.paths:
-                if aliased_path := const.ALIASED_OBJECTS[self.com.name].get(path.name, None):
-                    if not self.is_core:
-                        self.typing_imports.extend(path.used_typing)
-                    for name, params in aliased_path.items():
-                        self.write_answer(path, name, params)
+            for path in self.com.aliased_paths:
+                aliased_path = const.ALIASED_OBJECTS[self.com.name][path.name]
+                if not self.is_core:
+                    self.typing_imports.extend(path.used_typing)
+                for name, params in aliased_path.items():
+                    self.write_answer(path, name, params)
 
     def write_answer(self, path: Component, name: str, params: dict):
         if self.is_core:
@@ -258,7 +397,11 @@ class ObjectTemplate(ComponentTemplate):
     def adjusts(self):
         if self.com.is_adjusted:
             self.i("from ..bot.bot import Bot")
+            if self.bind_context and self.com.is_aliased:
+                self.bound_bot()
             self.m("def adjust(self, bot: Bot):")
+            if self.bind_context and self.com.is_aliased:
+                self.m("self._bot = bot", 2)
             if self.com.name == "Update":
                 self.m("self.event.adjust(bot)", 2)
                 return
@@ -277,6 +420,26 @@ class ObjectTemplate(ComponentTemplate):
                         else:
                             self.m(f"\tself.{arg}.adjust(bot)")
 
+    def bound_bot(self):
+        """
+        Keep bot current while object is built, received objects are built
+        inside of ``Bot.bound`` of receiving bot
+        """
+        self.typing_imports.append("Optional")
+        if not self.slots:
+            self.i("from pydantic import PrivateAttr")
+            self.m("_bot: Optional[Bot] = PrivateAttr(default_factory=lambda: Bot.current())")
+        self.m("@property")
+        self.m("def bot(self) -> Bot:")
+        self.m('"""Bot which received object"""', 2)
+        self.m("if self._bot is None:", 2)
+        self.m("raise RuntimeError(", 3)
+        self.m(f'"{self.com.camel} is not bound to a bot, "', 4)
+        self.m('"receive it through a bot, build it inside of `with bot.bound():` "', 4)
+        self.m('"or call adjust(bot)"', 4)
+        self.m(")", 3)
+        self.m("return self._bot", 2)
+
 
 @dc
 class PathTemplate(ComponentTemplate):
@@ -289,7 +452,8 @@ class PathTemplate(ComponentTemplate):
                 self.i("import abc")
                 extends.append("abc.ABC")
         else:
-            self.i(f"from ...core.paths.{self.com.module} import {self.com.camel} as _{self.com.camel}")
+            module = "" if self.bundled else f".{self.com.module}"
+            self.i(f"from ...core.paths{module} import {self.com.camel} as _{self.com.camel}")
             extends.append(f"_{self.com.camel}")
         if (
                 (self.is_core and ~self.com.is_adjusted) or
@@ -308,6 +472,10 @@ class PathTemplate(ComponentTemplate):
             self.typing_imports.extend(self.com.args_typing)
             for obj in self.com.args_objects:
                 self.i(f"from ..objects import {obj.camel}")
+            if self.slots and self.com.args_objects:
+                self.i("from ..objects.slots import JSON_ENCODERS")
+                self.a("class Config:")
+                self.a("json_encoders = JSON_ENCODERS", 2)
 
     def methods(self):
         if self.is_core:
@@ -321,6 +489,9 @@ class PathTemplate(ComponentTemplate):
         self.import_objects(self.com.result_objects)
         self.i("from ..bot.bot import Bot")
         self.m(f"def adjust(self, bot: Bot, result: {self.com.result.annotation}):")
+        if self.bind_context:
+            self.m('"""Result is bound to bot while built inside of ``Bot.bound``"""', 2)
+            return
         res = self.com.result
         if res.array:
             self.m(f"\tfor r in result: r.adjust(bot)")
@@ -341,7 +512,7 @@ class PathTemplate(ComponentTemplate):
         else:
             for a in self.com.args:
                 if self.api.input_file in a.com_types:
-                    if "attach://" in a.desc.text:
+                    if "attach://" in a.desc:
                         self.m(f"self.{a} = self.attach(self.{a})", 2)
                     else:
                         self.m(f"self.attach(self.{a}, '{a}')", 2)
@@ -356,40 +527,368 @@ class PathTemplate(ComponentTemplate):
 @dc
 class InitComponentsTemplate(PackageTemplate):
     ct: CategoryType = None
+    lazy: bool = False
+
+    @property
+    def category(self) -> Optional[CategoryType]:
+        return self.ct
 
     def __post_init__(self):
         super(InitComponentsTemplate, self).__post_init__()
         coms = []
         if self.ct == CategoryType.OBJECT:
-            coms = self.api.objects.copy()
+            coms = list(self.api.objects)
             coms.extend([
-                TELEGRAM_OBJECT,
+                comps.SLOTS_OBJECT if self.slots else TELEGRAM_OBJECT,
                 comps.TELEGRAM_RESPONSE,
                 comps.TELEGRAM_T,
                 comps.TELEGRAM_REQUEST
             ])
         elif self.ct == CategoryType.PATH:
-            coms = self.api.paths.copy()
+            coms = list(self.api.paths)
             coms.append(TELEGRAM_PATH)
 
         coms.sort(key=str)
 
+        # objects of package with names of their forward references,
+        # slots objects resolve names of their fields on parsing
+        refs = {}
+        if self.ct == CategoryType.OBJECT and not self.slots:
+            for o in self.api.objects:
+                if (self.is_core or o.is_adjusted) and o.used_objects:
+                    refs[o] = sorted(o.used_objects, key=str)
+
+        if self.lazy:
+            self.lazy_loader(coms, refs)
+            return
+
         for com in coms:
-            if self.is_core or com.is_adjusted:
-                self.i(f"from .{com.module} import {com.camel}")
-            else:
-                self.i(f"from ...core import {com.camel}")
+            self.write_import(com)
+
+        if self.bundled:
+            self.bundle()
+
+        self.all(coms)
+
+        if refs:
+            self.defer_forward_refs("globals()[name]")
+        for o, imports in refs.items():
+            names = [o.camel, *[repr(i.camel) for i in imports]]
+            self.d(f"_defer_forward_refs({','.join(names)})")
+
+    def defer_forward_refs(self, lookup: str):
+        """
+        Emit resolution of forward references of model on its first instantiation,
+        so only models which are validated resolve their references
+
+        :param lookup: expression of component by ``name`` in package
+        """
+        self.d("def _defer_forward_refs(cls, *names):", nl=1)
+        self.d("init = cls.__dict__.get('__init__')", 1)
+        self.d("def __init__(self, *args, **kwargs):", 1)
+        self.d("if init:", 2)
+        self.d("cls.__init__ = init", 3)
+        self.d("elif '__init__' in cls.__dict__:", 2)
+        self.d("del cls.__init__", 3)
+        self.d(f"cls.update_forward_refs(**{{name: {lookup} for name in names}})", 2)
+        self.d("self.__init__(*args, **kwargs)", 2)
+        self.d("cls.__init__ = __init__", 1)
+
+    def bundle(self):
+        """
+        Declare components of package in place of their own modules
+        """
+        if self.ct == CategoryType.OBJECT:
+            Tmp, coms = ObjectTemplate, self.api.objects
+        else:
+            Tmp, coms = PathTemplate, self.api.paths
+        for com in self.parents_first(coms):
+            if not (self.is_core or com.is_adjusted):
+                continue
+            tmp = Tmp(
+                api=self.api,
+                package=self.package,
+                com=com,
+                bundled=True,
+                bind_context=self.bind_context,
+                slots=self.slots,
+            )
+            self.sections["import"].extend(tmp.sections["import"])
+            self.typing_imports.extend(tmp.typing_imports)
+            self.object_imports.extend(tmp.object_imports)
+            self.type_checking_imports.extend(tmp.type_checking_imports)
+            for var in SECTIONS[1:]:
+                self.sections["declaration"].extend(tmp.sections[var])
+                self.d()
+
+    @staticmethod
+    def parents_first(coms: Iterable[Component]) -> List[Component]:
+        coms = list(coms)
+        order: Dict[Component, None] = {}
+
+        def visit(com: Component):
+            if com in order:
+                return
+            if com.parent in coms:
+                visit(com.parent)
+            order[com] = None
 
+        for c in coms:
+            visit(c)
+        return list(order)
+
+    def all(self, coms: List[Component]):
         self.d("__all__ = [")
         for com in coms:
             self.d(f'{com.camel!r},', 1)
         self.d("]")
 
-        if self.ct == CategoryType.OBJECT:
-            for o in self.api.objects:
-                if imports := (o.used_objects if self.is_core else o.adjusted_objects):
-                    refs = ','.join([f"{i}={i}" for i in imports])
-                    self.d(f"{o.camel}.update_forward_refs({refs})")
+    def lazy_loader(self, coms: List[Component], refs: Dict[Component, List[Component]]):
+        """
+        Import components on first access, PEP 562
+        """
+        self.i("import importlib")
+        self.i("from typing import TYPE_CHECKING")
+        self.i("if TYPE_CHECKING:")
+        self.write_import(*coms, tc=1)
+
+        self.all(coms)
+        self.d("_modules = {")
+        for com in coms:
+            module = f".{com.module}" if self.is_core or com.is_adjusted else "...core"
+            self.d(f"{com.camel!r}: {module!r},", 1)
+        self.d("}")
+        self.d("_forward_refs = {")
+        for o, imports in refs.items():
+            self.d(f"{o.camel!r}: ({''.join([f'{i.camel!r},' for i in imports])}),", 1)
+        self.d("}")
+
+        self.d("def __getattr__(name):", nl=1)
+        self.d("if name in globals():", 1)
+        self.d("return globals()[name]", 2)
+        self.d("if name not in _modules:", 1)
+        self.d('raise AttributeError(f"module {__name__!r} has no attribute {name!r}")', 2)
+        self.d("value = getattr(importlib.import_module(_modules[name], __name__), name)", 1)
+        self.d("globals()[name] = value", 1)
+        self.d("if name in _forward_refs:", 1)
+        self.d("_defer_forward_refs(value, *_forward_refs[name])", 2)
+        self.d("return value", 1)
+        self.defer_forward_refs("__getattr__(name)")
+        self.d("def __dir__():", nl=1)
+        self.d("return __all__", 1)
+
+
+@dc
+class DecodersTemplate(PackageTemplate):
+    """
+    Straight-line decoding of raw objects, without validation
+    """
+
+    def __post_init__(self):
+        super(DecodersTemplate, self).__post_init__()
+        objects = sorted(self.api.objects, key=str)
+        self.i("import json")
+        self.i("from typing import Any, Callable, Dict, Tuple, Union")
+        self.i(f"from . import ({','.join(o.camel for o in objects)})")
+        self.union()
+        for obj in objects:
+            self.decoder(obj)
+
+    @staticmethod
+    def name(obj: Component) -> str:
+        return f"{obj.snake}_from_dict"
+
+    def union(self):
+        self.d("Raw = Union[bytes, str, Dict[str, Any]]", nl=2)
+        self.d(
+            "def _union(value: Any, decoders: Tuple[Tuple[Tuple[str, ...], "
+            "Callable[[Any], Any]], ...]) -> Any:"
+        )
+        self.d('"""Decode **value** by the first decoder whose required keys it has"""', 1)
+        self.d("if not isinstance(value, dict):", 1)
+        self.d("return value", 2)
+        self.d("for required, decode in decoders[:-1]:", 1)
+        self.d("if all(key in value for key in required):", 2)
+        self.d("return decode(value)", 3)
+        self.d("return decoders[-1][1](value)", 1)
+
+    @staticmethod
+    def fallback(arg) -> Optional[str]:
+        """
+        Expression of value of **arg** missing in raw object, ``None`` if required
+        """
+        if arg.default:
+            return repr(arg.default)
+        if arg.array and arg.component and arg.component.is_object:
+            return "[]"
+        if arg.optional:
+            return "None"
+        return None
+
+    def convert(self, arg, value: str) -> str:
+        """
+        Expression decoding **value** of **arg**, element by element of arrays
+        """
+        if arg.union:
+            decoders = "".join(
+                f"({tuple(a.name for a in t.args if self.fallback(a) is None)!r}, {self.name(t)}),"
+                for t in arg.com_types
+            )
+            expr = f"_union({{}}, ({decoders}))"
+        else:
+            expr = f"{self.name(arg.com_types[0])}({{}})"
+        for depth in range(arg.array, 0, -1):
+            expr = f"[{expr.format(f'i{depth}')} for i{depth} in {{}}]"
+        return expr.format(value)
+
+    def value(self, arg) -> str:
+        key = repr(arg.name)
+        fallback = self.fallback(arg)
+
+        if not arg.com_types:
+            if fallback is None:
+                return f"d[{key}]"
+            return f"d.get({key}, {fallback})" if fallback != "None" else f"d.get({key})"
+        if fallback is None:
+            return self.convert(arg, f"d[{key}]")
+        return f"{fallback} if (v := d.get({key})) is None else {self.convert(arg, 'v')}"
+
+    def decoder(self, obj: Component):
+        self.d(f"def {self.name(obj)}(d: Raw) -> {obj.camel}:", nl=1)
+        self.d(f'"""Decode :class:`{obj.camel}` from JSON or its parsed dict"""', 1)
+        self.d("if not isinstance(d, dict):", 1)
+        self.d("d = json.loads(d)", 2)
+        if obj.discriminator:
+            return self.dispatch(obj)
+        create = obj.camel if self.slots else f"{obj.camel}.construct"
+        result = "obj = " if obj.name == "Update" and not self.slots else "return "
+        self.d(f"{result}{create}(", 1)
+        for arg in obj.args:
+            self.d(f"{arg}={self.value(arg)},", 2)
+        self.d(")", 1)
+        if result == "obj = ":
+            self.d(f"for name in {tuple(a.field for a in obj.args[1:])!r}:", 1)
+            self.d("if (event := getattr(obj, name)) is not None:", 2)
+            self.d("obj._event_type = event, name", 3)
+            self.d("break", 3)
+            self.d("return obj", 1)
+
+    def dispatch(self, obj: Component):
+        """
+        Body decoding subclass of **obj** chosen by value of its discriminator field
+        """
+        self.d(f"kind = d[{obj.discriminator!r}]", 1)
+        for value, sub in obj.variants.items():
+            self.d(f"if kind == {value!r}:", 1)
+            self.d(f"return {self.name(sub)}(d)", 2)
+        self.d(f'raise ValueError(f"unknown {obj.camel} {obj.discriminator} {{kind!r}}")', 1)
+
+
+@dc
+class EncodersTemplate(PackageTemplate):
+    """
+    Straight-line encoding of path arguments into request payload, without validation
+    """
+
+    def __post_init__(self):
+        super(EncodersTemplate, self).__post_init__()
+        self.i("from typing import Any, Dict, Tuple")
+        self.i("from ..objects import TelegramObject")
+        self.dump()
+        for path in self.api.paths:
+            self.encoder(path)
+
+    @staticmethod
+    def name(path: Component) -> str:
+        return f"{path.snake}_to_dict"
+
+    @staticmethod
+    def attached(api: Api, arg) -> Tuple[Tuple[str, str], ...]:
+        """
+        Attributes and keys of file fields of objects **arg** takes, sent as attachments
+        """
+        return tuple(sorted({
+            (a.field, a.name)
+            for t in arg.com_types if isinstance(t, Component)
+            for c in (t, *t.subclasses)
+            for a in c.args
+            if api.input_file and api.input_file in a.com_types
+        }))
+
+    @classmethod
+    def uploads(cls, api: Api, path: Component) -> bool:
+        """
+        Whether **path** may upload files
+        """
+        return bool(api.input_file) and any(
+            api.input_file in a.com_types or cls.attached(api, a) for a in path.args
+        )
+
+    def dump(self):
+        if self.api.input_file:
+            self.i("from ..objects import InputFile")
+        self.d("def _dump(value: Any) -> Any:", nl=1)
+        if self.api.input_file:
+            self.d("if isinstance(value, InputFile):", 1)
+            self.d("return value", 2)
+        self.d("if isinstance(value, TelegramObject):", 1)
+        self.d("return value.dict(by_alias=True, exclude_none=True)", 2)
+        self.d("return value", 1)
+        if not self.api.input_file:
+            return
+        signature = [
+            "value: TelegramObject",
+            "files: Dict[str, InputFile]",
+            "fields: Tuple[Tuple[str, str], ...]",
+        ]
+        self.d(f"def _attach({','.join(signature)}) -> Dict[str, Any]:", nl=1)
+        self.d('"""', 1)
+        self.d("Dump **value**, its files go to **files** and are referenced as attachments", 1)
+        self.d('"""', 1)
+        self.d("result = _dump(value)", 1)
+        self.d("for attr, key in fields:", 1)
+        self.d("file = getattr(value, attr, None)", 2)
+        self.d("if isinstance(file, InputFile):", 2)
+        self.d('name = f"file{len(files)}"', 3)
+        self.d("files[name] = file", 3)
+        self.d('result[key] = f"attach://{name}"', 3)
+        self.d("return result", 1)
+
+    def convert(self, arg, value: str) -> str:
+        """
+        Expression dumping **value** of **arg**, element by element of arrays
+        """
+        if not arg.com_types:
+            return value
+        attached = self.attached(self.api, arg)
+        expr = f"_attach({{}}, files, {attached!r})" if attached else "_dump({})"
+        for depth in range(arg.array, 0, -1):
+            expr = f"[{expr.format(f'i{depth}')} for i{depth} in {{}}]"
+        return expr.format(value)
+
+    def encoder(self, path: Component):
+        signature = [f"{a}{a.method_value}" for a in path.args]
+        params = ','.join(['*', *signature]) if signature else ''
+        self.d(f"def {self.name(path)}({params}) -> Dict[str, Any]:", nl=1)
+        attaches = any(self.attached(self.api, a) for a in path.args)
+        if attaches:
+            self.d('"""', 1)
+            self.d(f"Payload of :class:`{path.camel}`, ``None`` arguments are skipped,", 1)
+            self.d("files of objects are put next to arguments as attachments", 1)
+            self.d('"""', 1)
+            self.d("files: Dict[str, InputFile] = {}", 1)
+        else:
+            self.d(f'"""Payload of :class:`{path.camel}`, ``None`` arguments are skipped"""', 1)
+        required = [a for a in path.args if not a.optional]
+        items = ','.join(f'{a.name!r}: {self.convert(a, a.field)}' for a in required)
+        self.d(f"payload = {{{items}}}", 1)
+        for a in path.args:
+            if a.optional:
+                self.d(f"if {a} is not None:", 1)
+                self.d(f"payload[{a.name!r}] = {self.convert(a, a.field)}", 2)
+        if attaches:
+            self.d("payload.update(files)", 1)
+        self.d("return payload", 1)
 
 
 @dc
@@ -419,6 +918,13 @@ class BotTemplate(PackageTemplate):
             self.i(f"from ..paths import ({','.join(map(str, self.api.paths))})")
             self.i(f"from ..objects import ({','.join(map(str, self.api.paths_objects))})")
             self.i(f"from ..objects import T")
+            if self.direct:
+                self.i("from typing import Any, Dict, Type")
+                encoders = [EncodersTemplate.name(p) for p in self.api.paths]
+                if encoders:
+                    self.i(f"from ...core.paths.encoders import ({','.join(encoders)})")
+                if self.api.input_file:
+                    self.i("from ...core.paths.multipart import Multipart")
         self.i("from ..paths import TelegramPath", int(self.is_core))
 
     def declaration(self):
@@ -426,8 +932,18 @@ class BotTemplate(PackageTemplate):
         if self.is_core:
             parent = "abc.ABC"
 
+            if self.bind_context:
+                self.i("from contextlib import contextmanager")
+                self.i("from contextvars import ContextVar")
+                self.i("from typing import Iterator")
+                self.d(
+                    '_current_bot: ContextVar[Optional[Bot]] = '
+                    'ContextVar("current_bot", default=None)'
+                )
         else:
             self.d(f"from ...core.bot.base import {parent}")
+            if self.shared_pool:
+                self.client_pool()
         self.d(f"class Bot({parent}):", nl=0)
         self.a('"'*3)
         self.a("Client instance for work with Telegram Bot API")
@@ -439,6 +955,68 @@ class BotTemplate(PackageTemplate):
         else:
             self.i(f"from ..http import HttpX")
             self.a(f"__http__ = HttpX")
+            if self.direct:
+                self.a("# build and validate path models instead of encoding payloads")
+                self.a("__validate__ = False")
+            if self.shared_pool:
+                self.a("__pool__: Type[ClientPool] = ClientPool")
+
+    def client_pool(self):
+        """
+        Declare HTTP client shared by bots of the process, counted by its users
+        """
+        client = "httpx.AsyncClient" if self.is_aio else "httpx.Client"
+        self.i("import asyncio" if self.is_aio else "import threading")
+        self.i("import httpx")
+        self.i("from typing import Any, Type")
+        self.d("class ClientPool:", nl=1)
+        self.d('"""', 1)
+        self.d("HTTP client shared by every bot of the process", 1, 2)
+        self.d("Bots acquire it on first request and release it on cleanup,", 1)
+        self.d("the last release closes it. Subclass or :meth:`configure` it", 1)
+        self.d("before the first bot starts, HTTP/2 needs ``httpx[http2]``.", 1)
+        self.d("Bots send through Http of config, passing it the client.", 1)
+        self.d('"""', 1)
+        self.d("max_connections: Optional[int] = 100", 1)
+        self.d("max_keepalive_connections: Optional[int] = 20", 1)
+        self.d("keepalive_expiry: Optional[float] = 5.0", 1)
+        self.d("http2: bool = False", 1)
+        self.d(f"client: Optional[{client}] = None", 1)
+        self.d("users: int = 0", 1)
+        # critical sections do not await, so lock of aio pool is not bound to a loop
+        self.d(f"lock = {'asyncio.Lock()' if self.is_aio else 'threading.RLock()'}", 1, 2)
+
+        self.d("@classmethod", 1)
+        self.d("def configure(cls, **options: Any):", 1)
+        self.d("for name, value in options.items():", 2)
+        options = "'max_connections', 'max_keepalive_connections', 'keepalive_expiry', 'http2'"
+        self.d(f"if name not in {{{options}}}:", 3)
+        self.d('raise TypeError(f"Unknown option {name!r}")', 4)
+        self.d("setattr(cls, name, value)", 3)
+
+        self.d("@classmethod", 1)
+        self.d(f"{self.async_}def acquire(cls) -> {client}:", 1)
+        self.d(f"{self.async_}with cls.lock:", 2)
+        self.d("if cls.client is None:", 3)
+        self.d(f"cls.client = {client}(", 4)
+        self.d("limits=httpx.Limits(", 5)
+        self.d("max_connections=cls.max_connections,", 6)
+        self.d("max_keepalive_connections=cls.max_keepalive_connections,", 6)
+        self.d("keepalive_expiry=cls.keepalive_expiry,", 6)
+        self.d("),", 5)
+        self.d("http2=cls.http2,", 5)
+        self.d(")", 4)
+        self.d("cls.users += 1", 3)
+        self.d("return cls.client", 3)
+
+        self.d("@classmethod", 1)
+        self.d(f"{self.async_}def release(cls):", 1)
+        self.d(f"{self.async_}with cls.lock:", 2)
+        self.d("cls.users -= 1", 3)
+        self.d("if cls.users or cls.client is None:", 3)
+        self.d("return", 4)
+        self.d("client, cls.client = cls.client, None", 3)
+        self.d(f"{self.await_}client.{'aclose' if self.is_aio else 'close'}()", 2)
 
     def methods(self):
         for h in self.api.headers:
@@ -476,9 +1054,36 @@ class BotTemplate(PackageTemplate):
         self.m("@abc.abstractmethod")
         self.m(f"def cleanup(self): ...")
 
+        if self.bind_context:
+            self.m("@contextmanager")
+            self.m("def bound(self) -> Iterator[Bot]:")
+            self.m('"""Bind bot to objects built inside of the block, like received ones"""', 2)
+            self.m("token = _current_bot.set(self)", 2)
+            self.m("try:", 2)
+            self.m("yield self", 3)
+            self.m("finally:", 2)
+            self.m("_current_bot.reset(token)", 3)
+
+            self.m("@staticmethod")
+            self.m("def current() -> Optional[Bot]:")
+            self.m('"""Bot binding objects built in this context, if any"""', 2)
+            self.m("return _current_bot.get()", 2)
+
+    @property
+    def pooled(self) -> str:
+        """
+        Argument passing client of the pool to Http of config
+        """
+        return f", client={self.await_}self.connect()" if self.shared_pool else ""
+
     def base_methods(self):
         self.m(f"{self.async_}def __call__(self, path: TelegramPath, http_timeout: Optional[float] = None) -> T:")
-        self.m(f"return {self.await_}self.config.http(self, path, http_timeout)", 2)
+        call = f"return {self.await_}self.config.http(self, path, http_timeout{self.pooled})"
+        if self.bind_context:
+            self.m("with self.bound():", 2)
+            self.m(call, 3)
+        else:
+            self.m(call, 2)
 
         self.m(f"{self.async_}def update_me(self): self._me = {self.await_}self.get_me()")
         a = 'a' if self.is_aio else ''
@@ -488,9 +1093,162 @@ class BotTemplate(PackageTemplate):
         self.m(f"return self", 2)
 
         self.m(f"{self.async_}def __{a}exit__(self, exc_type, exc_val, exc_tb):")
-        self.m(f"{self.await_}self.http.close()", 2)
+        if self.shared_pool:
+            self.m(f"{self.await_}self.cleanup()", 2)
+        else:
+            self.m(f"{self.await_}self.http.close()", 2)
 
-        self.m(f"{self.async_}def cleanup(self): {self.await_}self.http.close()")
+        if self.shared_pool:
+            self.shared_client()
+        else:
+            self.m(f"{self.async_}def cleanup(self): {self.await_}self.http.close()")
+
+        if self.is_aio and self.shared_pool:
+            self.batch()
+
+        if self.direct:
+            self.send()
+
+    @property
+    def payload(self) -> str:
+        """
+        Annotation of encoded payload
+        """
+        if self.api.input_file:
+            return "Union[Dict[str, Any], Multipart]"
+        return "Dict[str, Any]"
+
+    def send(self):
+        """
+        Send encoded payloads and parse responses to them without path models
+        """
+        self.i("from ...core.objects.response import Response")
+        signature = [
+            "self",
+            "path: Type[TelegramPath]",
+            "response: Type[Response]",
+            f"payload: {self.payload}",
+            "http_timeout: Optional[float] = None",
+        ]
+        self.m(f"{self.async_}def send({','.join(signature)}) -> T:")
+        self.m('"""', 2)
+        self.m("Send encoded **payload** of **path** without building its model", 2, 2)
+        self.m(":param response: model of response body to **path**", 2)
+        self.m(":returns: result of response, bound to bot", 2)
+        self.m(":raises RuntimeError: response is not ok", 2)
+        self.m('"""', 2)
+        indent = 2
+        if self.bind_context:
+            self.m("with self.bound():", 2)
+            indent = 3
+        self.m(f"raw = {self.await_}self.post(path, payload, http_timeout)", indent)
+        self.m("if isinstance(raw, dict):", indent)
+        self.m("parsed = response.parse_obj(raw)", indent + 1)
+        self.m("else:", indent)
+        self.m("parsed = response.parse_raw(raw)", indent + 1)
+        self.m("if not parsed.ok:", 2)
+        self.m("description = getattr(parsed, 'description', None)", 3)
+        self.m('raise RuntimeError(f"{path.__name__} failed: {description}")', 3)
+        if not self.bind_context:
+            self.m("self._adjust(parsed.result)", 2)
+        self.m("return parsed.result", 2)
+
+        if not self.bind_context:
+            self.m("def _adjust(self, result: Any):")
+            self.m("if isinstance(result, list):", 2)
+            self.m("for r in result:", 3)
+            self.m("self._adjust(r)", 4)
+            self.m("elif hasattr(result, 'adjust'):", 2)
+            self.m("result.adjust(self)", 3)
+
+        signature = [
+            "self",
+            "path: Type[TelegramPath]",
+            f"payload: {self.payload}",
+            "http_timeout: Optional[float] = None",
+        ]
+        self.m(f"{self.async_}def post({','.join(signature)}) -> Any:")
+        self.m('"""', 2)
+        self.m("Raw response body to **payload** of **path**", 2, 2)
+        self.m("Sent by ``post(bot, path, payload, timeout)`` of Http of config,", 2)
+        if self.shared_pool:
+            self.m("through client of :attr:`__pool__`,", 2)
+        if self.api.input_file:
+            self.m("payload uploading files is :class:`Multipart` body,", 2)
+        self.m("override to send payloads another way.", 2)
+        self.m('"""', 2)
+        self.m("post = getattr(self.config.http, 'post', None)", 2)
+        self.m("if post is None:", 2)
+        self.m("raise NotImplementedError(", 3)
+        self.m('f"{type(self.config.http).__name__} "', 4)
+        self.m('"has no post(bot, path, payload, timeout), "', 4)
+        self.m('"set Bot.__validate__ to send path models"', 4)
+        self.m(")", 3)
+        self.m(f"return {self.await_}post(self, path, payload, http_timeout{self.pooled})", 2)
+
+    def shared_client(self):
+        client = "httpx.AsyncClient" if self.is_aio else "httpx.Client"
+        self.m(f"{self.async_}def connect(self) -> {client}:")
+        self.m('"""Client of :attr:`__pool__`, acquired once on first use"""', 2)
+        if self.is_aio:
+            # pool lock is never held across an await, so acquiring does not suspend
+            self.m("if getattr(self, '_client', None) is None:", 2)
+            self.m("self._client = await self.__pool__.acquire()", 3)
+            self.m("return self._client", 2)
+        else:
+            self.m("client = getattr(self, '_client', None)", 2)
+            self.m("if client is None:", 2)
+            self.m("with self.__pool__.lock:", 3)
+            self.m("if getattr(self, '_client', None) is None:", 4)
+            self.m("self._client = self.__pool__.acquire()", 5)
+            self.m("client = self._client", 4)
+            self.m("return client", 2)
+
+        self.m(f"{self.async_}def cleanup(self):")
+        self.m('"""Release client of :attr:`__pool__`, once per acquiring"""', 2)
+        self.m(f"{self.await_}self.http.close()", 2)
+        if self.is_aio:
+            self.m("client, self._client = getattr(self, '_client', None), None", 2)
+        else:
+            self.m("with self.__pool__.lock:", 2)
+            self.m("client, self._client = getattr(self, '_client', None), None", 3)
+        self.m("if client is not None:", 2)
+        self.m(f"{self.await_}self.__pool__.release()", 3)
+
+    def batch(self):
+        """
+        Send many paths at once over connections of the pool
+        """
+        self.i("import asyncio")
+        self.i("from typing import Any, Iterable")
+        signature = [
+            "self",
+            "paths: Iterable[TelegramPath]",
+            "concurrency: int = 10",
+            "http_timeout: Optional[float] = None",
+        ]
+        self.m(f"async def map({','.join(signature)}) -> List[Any]:")
+        self.m('"""', 2)
+        self.m("Send **paths** over shared connections, at most **concurrency** at once", 2, 2)
+        self.m(":param paths: paths to send, consumed as requests complete", 2)
+        self.m(":param concurrency: requests in flight", 2)
+        self.m(":param http_timeout: (float) ", 2)
+        self.m(":returns: results in order of **paths**, exception in place of failed request", 2)
+        self.m(":raises ValueError: **concurrency** is less than one", 2)
+        self.m('"""', 2)
+        self.m("if concurrency < 1:", 2)
+        self.m('raise ValueError(f"concurrency must be at least 1, got {concurrency}")', 3)
+        self.m("results: List[Any] = []", 2)
+        self.m("pending = enumerate(paths)", 2)
+        self.m("async def worker():", 2)
+        self.m("for i, path in pending:", 3)
+        self.m("results.extend([None] * (i + 1 - len(results)))", 4)
+        self.m("try:", 4)
+        self.m("results[i] = await self(path, http_timeout)", 5)
+        self.m("except Exception as e:", 4)
+        self.m("results[i] = e", 5)
+        self.m("await asyncio.gather(*[worker() for _ in range(concurrency)])", 2)
+        self.m("return results", 2)
 
     def get_signature(self, path: Component):
         signature = ["self"]
@@ -503,11 +1261,11 @@ class BotTemplate(PackageTemplate):
     def method_description(self, path: Component):
         self.m('"'*3, 2)
         for p in path.desc:
-            for pp in wrap(p.text):
+            for pp in wrap(p):
                 self.m(pp, 2)
             self.m()
         for arg in path.args:
-            desc = f":param {arg.field}: {arg.desc.text}"
+            desc = f":param {arg.field}: {arg.desc}"
             wrapped_desc = '\n\t\t'.join(wrap(desc, subsequent_indent="\t", width=66))
             self.m(wrapped_desc, 2)
         self.m(f":param http_timeout: (float) ", 2, 2)
@@ -518,6 +1276,25 @@ class BotTemplate(PackageTemplate):
     def method_declaration(self, path: Component):
         if self.is_core:
             self.m("...", 2)
-        else:
-            args = ','.join([f"{a}={a}" for a in path.args])
+            return
+        args = ','.join([f"{a}={a}" for a in path.args])
+        if not self.direct:
             self.m(f"return {self.await_}self({path.camel}({args}), http_timeout=http_timeout)", 2)
+            return
+        self.m("if self.__validate__:", 2)
+        self.m(f"return {self.await_}self({path.camel}({args}), http_timeout=http_timeout)", 3)
+        if path.name == "sendMediaGroup":
+            self.m("for m in media:", 2)
+            self.m("m.parse_mode = self.config.preset.parse_mode(m.parse_mode)", 3)
+        payload = ','.join([
+            f"{a}=self.config.preset.{a}({a})" if a.name in const.PRESETS else f"{a}={a}"
+            for a in path.args
+        ])
+        payload = f"{EncodersTemplate.name(path)}({payload})"
+        if EncodersTemplate.uploads(self.api, path):
+            payload = f"Multipart.from_payload({payload})"
+        self.m(
+            f"return {self.await_}self.send({path.camel}, Response[{path.result.annotation}], "
+            f"{payload}, http_timeout=http_timeout)",
+            2,
+        )
@@ -1,3 +1,4 @@
+from dataclasses import fields
 from functools import lru_cache
 
 
@@ -17,3 +18,35 @@ def snake(text: str):
 
 def wrap(_type, _statement, _value):
     return f"{_type}[{_value}]" if _statement else _value
+
+
+def slots(cls):
+    """
+    Rebuild dataclass **cls** with ``__slots__`` of its fields
+
+    :param cls:
+    :return:
+    """
+    names = tuple(f.name for f in fields(cls))
+    body = {
+        k: v for k, v in cls.__dict__.items()
+        if k not in {*names, "__dict__", "__weakref__"}
+    }
+    body["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, body)
+
+
+class Final:
+    """
+    Object with read-only attributes after :meth:`freeze`
+    """
+    __slots__ = ("_final",)
+
+    def __setattr__(self, key, value):
+        if getattr(self, "_final", False):
+            raise AttributeError(f"{type(self).__name__} is final, can't set {key!r}")
+        object.__setattr__(self, key, value)
+
+    def freeze(self):
+        object.__setattr__(self, "_final", True)
+        return self
@@ -0,0 +1,43 @@
+import pathlib
+from typing import Callable
+
+import pytest
+
+from cleangram_codegen.generator import Generator
+from cleangram_codegen.models import Api
+from cleangram_codegen.parser import get_api
+from cleangram_codegen.sinks import MemorySink
+
+DATA = pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture(scope="session")
+def api() -> Api:
+    """
+    Bot API page snapshot cut down to a few components of every kind
+    """
+    return get_api(DATA / "api.html", cache_dir=None)
+
+
+@pytest.fixture(scope="session")
+def base() -> pathlib.Path:
+    """
+    Stand-ins for hand-written part of cleangram generated code depends on
+    """
+    return DATA
+
+
+@pytest.fixture
+def render(api) -> Callable[..., MemorySink]:
+    """
+    Render generated package of **options** into memory
+    """
+
+    def render(**options) -> MemorySink:
+        sink = MemorySink()
+        Generator(
+            cache_dir=None, jobs=1, incremental=False, sink=sink, api=api, **options,
+        ).run()
+        return sink
+
+    return render
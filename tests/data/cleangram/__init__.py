@@ -0,0 +1,4 @@
+"""
+Stand-ins for hand-written part of cleangram, just enough to import generated code
+and to send its direct payloads
+"""
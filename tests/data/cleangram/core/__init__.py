@@ -0,0 +1,9 @@
+import importlib
+
+
+def __getattr__(name):
+    for m in ("objects", "paths"):
+        m = importlib.import_module(f"{__name__}.{m}")
+        if name in m.__all__:
+            return getattr(m, name)
+    raise AttributeError(name)
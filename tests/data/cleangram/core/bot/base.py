@@ -0,0 +1,5 @@
+from .bot import Bot
+
+
+class BaseBot(Bot):
+    pass
@@ -0,0 +1,59 @@
+import json
+from typing import Any, Dict
+
+SERVER = "https://api.telegram.org"
+
+
+class Http:
+    """
+    Transport of bot requests to Bot API server
+
+    :param server: root URL of Bot API server
+    """
+
+    def __init__(self, server: str = SERVER):
+        self.server = server.rstrip("/")
+
+    def url(self, bot, path: type) -> str:
+        """
+        Endpoint of method of **path** for **bot**
+        """
+        name = path.__name__
+        return f"{self.server}/bot{bot.token}/{name[0].lower()}{name[1:]}"
+
+    @staticmethod
+    def content(response) -> bytes:
+        """
+        Body of httpx **response**, error status raises unless body is JSON of Bot API
+
+        :raises httpx.HTTPStatusError: error status without JSON body
+        """
+        if response.is_error and not response.headers.get("content-type", "").startswith(
+                "application/json"
+        ):
+            response.raise_for_status()
+        return response.content
+
+    @staticmethod
+    def encode(path) -> Dict[str, Any]:
+        """
+        Payload of **path** model
+        """
+        return json.loads(path.json(by_alias=True, exclude_none=True))
+
+    @staticmethod
+    def result(path, raw: bytes) -> Any:
+        """
+        Result of response body **raw** to **path** model
+
+        :raises RuntimeError: response is not ok
+        """
+        response = type(path).__response__.parse_raw(raw)
+        if not response.ok:
+            description = getattr(response, "description", None)
+            raise RuntimeError(f"{type(path).__name__} failed: {description}")
+        return response.result
+
+
+class HttpX(Http):
+    pass
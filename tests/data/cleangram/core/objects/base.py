@@ -0,0 +1,5 @@
+import functools
+from pydantic import BaseModel
+class TelegramObject(BaseModel):
+    class Config:
+        keep_untouched = (functools._lru_cache_wrapper,)
@@ -0,0 +1 @@
+class Request: pass
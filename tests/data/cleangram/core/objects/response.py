@@ -0,0 +1,6 @@
+from typing import Generic, TypeVar, Optional
+from pydantic.generics import GenericModel
+T = TypeVar("T")
+class Response(GenericModel, Generic[T]):
+    ok: bool
+    result: Optional[T] = None
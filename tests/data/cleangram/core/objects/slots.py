@@ -0,0 +1,173 @@
+import json
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple, Type
+
+_resolved: Dict[type, Dict[str, Tuple[Tuple[type, ...], int]]] = {}
+
+
+class TelegramObject:
+    """
+    Object of Telegram Bot API kept in slots
+
+    Subclasses declare ``__fields__`` as pairs of attribute and key,
+    ``__objects__`` as names of field classes and array depth by attribute,
+    ``__required__`` as keys without default and ``__defaults__`` by attribute,
+    parents declare ``__variants__`` as key of discriminator field
+    and names of subclasses by its value,
+    names are resolved in package of subclass on first parsing.
+    """
+    __slots__ = ()
+    __fields__: Tuple[Tuple[str, str], ...] = ()
+    __objects__: Dict[str, Tuple[Tuple[str, ...], int]] = {}
+    __required__: Tuple[str, ...] = ()
+    __defaults__: Dict[str, Any] = {}
+    __variants__: Tuple[str, Dict[str, str]] = ("", {})
+
+    @classmethod
+    def _objects(cls) -> Dict[str, Tuple[Tuple[type, ...], int]]:
+        try:
+            return _resolved[cls]
+        except KeyError:
+            package = sys.modules[sys.modules[cls.__module__].__package__]
+            objects = _resolved[cls] = {
+                attr: (tuple(getattr(package, name) for name in names), array)
+                for attr, (names, array) in cls.__objects__.items()
+            }
+            return objects
+
+    @classmethod
+    def _variant(cls, obj: Any) -> type:
+        """
+        Subclass of **obj** by value of discriminator field, **cls** itself if unknown
+        """
+        key, variants = cls.__variants__
+        if not key or cls.__name__ in variants.values():
+            return cls
+        name = variants.get(obj.get(key))
+        if name is None:
+            return cls
+        return getattr(sys.modules[sys.modules[cls.__module__].__package__], name)
+
+    @classmethod
+    def parse_obj(cls, obj: Any):
+        if isinstance(obj, cls):
+            return obj
+        variant = cls._variant(obj)
+        if variant is not cls:
+            return variant.parse_obj(obj)
+        objects = cls._objects()
+        kwargs = {}
+        for attr, key in cls.__fields__:
+            if key in obj:
+                value = obj[key]
+                if value is not None and attr in objects:
+                    value = _decode(value, *objects[attr])
+                kwargs[attr] = value
+        return cls(**kwargs)
+
+    @classmethod
+    def parse_raw(cls, b):
+        return cls.parse_obj(json.loads(b))
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.parse_obj
+
+    def dict(
+            self,
+            *,
+            include: Optional[Iterable[str]] = None,
+            exclude: Optional[Iterable[str]] = None,
+            by_alias: bool = False,
+            exclude_unset: bool = False,
+            exclude_defaults: bool = False,
+            exclude_none: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Fields like :meth:`pydantic.BaseModel.dict`,
+        **include** and **exclude** apply to fields of this object,
+        unset fields are not tracked, so **exclude_unset** skips default values
+        """
+        flags = dict(
+            by_alias=by_alias,
+            exclude_unset=exclude_unset,
+            exclude_defaults=exclude_defaults,
+            exclude_none=exclude_none,
+        )
+        result = {}
+        for attr, key in self.__fields__:
+            if (include is not None and attr not in include) or (exclude and attr in exclude):
+                continue
+            value = getattr(self, attr)
+            if value is None and exclude_none:
+                continue
+            if (
+                    (exclude_defaults or exclude_unset) and
+                    attr in self.__defaults__ and value == self.__defaults__[attr]
+            ):
+                continue
+            result[key if by_alias else attr] = _encode(value, flags)
+        return result
+
+    def json(
+            self,
+            *,
+            include: Optional[Iterable[str]] = None,
+            exclude: Optional[Iterable[str]] = None,
+            by_alias: bool = False,
+            exclude_unset: bool = False,
+            exclude_defaults: bool = False,
+            exclude_none: bool = False,
+            **dumps_kwargs: Any,
+    ) -> str:
+        return json.dumps(self.dict(
+            include=include,
+            exclude=exclude,
+            by_alias=by_alias,
+            exclude_unset=exclude_unset,
+            exclude_defaults=exclude_defaults,
+            exclude_none=exclude_none,
+        ), **dumps_kwargs)
+
+    def copy(self):
+        copied = type(self)(**{attr: getattr(self, attr) for attr, _ in self.__fields__})
+        for cls in type(self).__mro__:
+            for attr in getattr(cls, "__slots__", ()):
+                if attr.startswith("_"):
+                    setattr(copied, attr, getattr(self, attr))
+        return copied
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a, _ in self.__fields__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{a}={getattr(self, a)!r}" for a, _ in self.__fields__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _decode(value: Any, classes: Tuple[Type[TelegramObject], ...], array: int) -> Any:
+    if array:
+        return [_decode(v, classes, array - 1) for v in value]
+    if not isinstance(value, dict):
+        return value
+    # member of union is the first one having every required key
+    for cls in classes[:-1]:
+        if all(key in value for key in cls.__required__):
+            return cls.parse_obj(value)
+    return classes[-1].parse_obj(value)
+
+
+def _encode(value: Any, flags: Dict[str, bool]) -> Any:
+    if isinstance(value, TelegramObject):
+        return value.dict(**flags)
+    if isinstance(value, list):
+        return [_encode(v, flags) for v in value]
+    return value
+
+
+# ``Config.json_encoders`` of pydantic models of paths having nested objects
+JSON_ENCODERS = {TelegramObject: lambda o: o.dict(by_alias=True, exclude_none=True)}
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+class TelegramPath(BaseModel):
+    def __init_subclass__(cls, response=None, **kw):
+        super().__init_subclass__(**kw)
+        if response is not None:
+            cls.__response__ = response
@@ -0,0 +1,237 @@
+import asyncio
+import io
+import json
+import os
+import pathlib
+import uuid
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, PrivateAttr
+
+from ..objects import InputFile
+
+CHUNK_SIZE = 64 * 1024
+OCTET = "application/octet-stream"
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+class FileReader(io.RawIOBase):
+    """
+    Local file read in chunks, opened on first read
+
+    :param source: path of file or binary file object positioned at start of upload
+    """
+
+    def __init__(self, source: Source, filename: Optional[str] = None, content_type: str = OCTET):
+        super(FileReader, self).__init__()
+        if isinstance(source, (str, os.PathLike)):
+            self.path: Optional[pathlib.Path] = pathlib.Path(source)
+            self.file: Optional[BinaryIO] = None
+            self.start = 0
+            self.size = self.path.stat().st_size
+            default = self.path.name
+        else:
+            self.path = None
+            self.file = source
+            try:
+                self.start: Optional[int] = source.tell()
+            except OSError:
+                self.start = None
+            self.size = self._remaining()
+            default = os.path.basename(getattr(source, "name", "file"))
+        self.filename = filename or default
+        self.content_type = content_type
+        self.pos = 0
+
+    def _remaining(self) -> Optional[int]:
+        """
+        Bytes of file object after start, ``None`` if it is not seekable
+        """
+        if self.start is None:
+            return None
+        try:
+            return os.fstat(self.file.fileno()).st_size - self.start
+        except (AttributeError, OSError):
+            pass
+        try:
+            end = self.file.seek(0, io.SEEK_END)
+            self.file.seek(self.start)
+        except OSError:
+            return None
+        return end - self.start
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.start is not None
+
+    def readinto(self, b) -> int:
+        if self.file is None:
+            self.file = open(self.path, "rb")
+        if self.start is not None:
+            self.file.seek(self.start + self.pos)
+        view = memoryview(b)
+        if self.size is not None:
+            view = view[:max(0, self.size - self.pos)]
+        n = self.file.readinto(view) or 0
+        self.pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END and self.size is None:
+            raise io.UnsupportedOperation("size of file is unknown")
+        self.pos = offset + (0, self.pos, self.size)[whence]
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def close(self):
+        if self.path and self.file:
+            self.file.close()
+            self.file = None
+        super(FileReader, self).close()
+
+    def chunks(self) -> Iterator[bytes]:
+        self.seek(0)
+        while chunk := self.read(CHUNK_SIZE):
+            yield chunk
+
+
+class FilePart(InputFile):
+    """
+    File to upload, streamed in chunks of :data:`CHUNK_SIZE` from disk
+
+    Reader is private attribute of pydantic objects and slot of slots objects.
+    """
+
+    if issubclass(InputFile, BaseModel):
+        _reader: FileReader = PrivateAttr()
+    else:
+        __slots__ = ("_reader",)
+
+    def __init__(self, source: Source, filename: Optional[str] = None, content_type: str = OCTET):
+        super(FilePart, self).__init__()
+        self._reader = FileReader(source, filename, content_type)
+
+    @property
+    def name(self) -> str:
+        return self._reader.filename
+
+    @property
+    def content_type(self) -> str:
+        return self._reader.content_type
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._reader.size
+
+    def read(self, size: int = -1) -> bytes:
+        return self._reader.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._reader.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._reader.tell()
+
+    def close(self):
+        self._reader.close()
+
+    def chunks(self) -> Iterator[bytes]:
+        return self._reader.chunks()
+
+
+class Multipart:
+    """
+    ``multipart/form-data`` body, files are read chunk by chunk while it is sent
+
+    Length is known beforehand, so body is sent without chunked encoding,
+    unless size of some file is unknown.
+
+    :param fields: values of arguments, not strings are dumped to JSON
+    :param files: parts by name of field
+    """
+
+    def __init__(
+            self,
+            fields: Dict[str, Any],
+            files: Dict[str, FilePart],
+            boundary: Optional[str] = None,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.fields: List[Tuple[bytes, bytes]] = [
+            (self._head(name), (v if isinstance(v, str) else json.dumps(v)).encode("utf-8"))
+            for name, v in fields.items()
+        ]
+        self.files: List[Tuple[bytes, FilePart]] = [
+            (self._head(name, part), part) for name, part in files.items()
+        ]
+        self.end = f"--{self.boundary}--\r\n".encode("ascii")
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> Union[Dict[str, Any], "Multipart"]:
+        """
+        **payload** as is or, if it has files, body uploading them
+
+        :raises TypeError: file is not :class:`FilePart`
+        """
+        files = {name: v for name, v in payload.items() if isinstance(v, InputFile)}
+        if not files:
+            return payload
+        for name, part in files.items():
+            if not isinstance(part, FilePart):
+                raise TypeError(f"{name} is {type(part).__name__}, upload files as FilePart")
+        return cls({name: v for name, v in payload.items() if name not in files}, files)
+
+    def _head(self, name: str, part: Optional[FilePart] = None) -> bytes:
+        head = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"'
+        if part is not None:
+            head += f'; filename="{part.name}"\r\nContent-Type: {part.content_type}'
+        return f"{head}\r\n\r\n".encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def length(self) -> Optional[int]:
+        """
+        Bytes of body, ``None`` if size of some file is unknown
+        """
+        if any(part.size is None for _, part in self.files):
+            return None
+        return (
+            sum(len(head) + len(value) + 2 for head, value in self.fields) +
+            sum(len(head) + part.size + 2 for head, part in self.files) +
+            len(self.end)
+        )
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": self.content_type}
+        if (length := self.length) is not None:
+            headers["Content-Length"] = str(length)
+        return headers
+
+    def __iter__(self) -> Iterator[bytes]:
+        for head, value in self.fields:
+            yield head + value + b"\r\n"
+        for head, part in self.files:
+            yield head
+            yield from part.chunks()
+            yield b"\r\n"
+        yield self.end
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        for head, value in self.fields:
+            yield head + value + b"\r\n"
+        for head, part in self.files:
+            yield head
+            part.seek(0)
+            while chunk := await loop.run_in_executor(None, part.read, CHUNK_SIZE):
+                yield chunk
+            yield b"\r\n"
+        yield self.end
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Optional, Union
+
+import httpx
+
+from ..core.http import SERVER, Http
+from ..core.paths.multipart import Multipart
+
+
+class HttpX(Http):
+    """
+    Transport over own :class:`httpx.Client`, opened on first request,
+    or over client given to request
+    """
+
+    def __init__(self, server: str = SERVER):
+        super(HttpX, self).__init__(server)
+        self.client: Optional[httpx.Client] = None
+
+    def post(
+            self,
+            bot,
+            path: type,
+            payload: Union[Dict[str, Any], Multipart],
+            timeout: Optional[float] = None,
+            client: Optional[httpx.Client] = None,
+    ) -> bytes:
+        """
+        Raw response body to encoded **payload** of **path**
+
+        :param client: client to send through instead of own one
+        """
+        if client is None:
+            if self.client is None:
+                self.client = httpx.Client()
+            client = self.client
+        options: Dict[str, Any] = {} if timeout is None else {"timeout": timeout}
+        if isinstance(payload, Multipart):
+            options.update(content=iter(payload), headers=payload.headers)
+        else:
+            options.update(json=payload)
+        return self.content(client.post(self.url(bot, path), **options))
+
+    def __call__(
+            self,
+            bot,
+            path,
+            timeout: Optional[float] = None,
+            client: Optional[httpx.Client] = None,
+    ) -> Any:
+        """
+        Result of **path** model sent by **bot**
+
+        :param client: client to send through instead of own one
+        """
+        if hasattr(path, "prepare"):
+            path.prepare(bot)
+        raw = self.post(bot, type(path), self.encode(path), timeout, client)
+        result = self.result(path, raw)
+        if hasattr(path, "adjust"):
+            path.adjust(bot, result)
+        return result
+
+    def close(self):
+        client, self.client = self.client, None
+        if client is not None:
+            client.close()
@@ -0,0 +1 @@
+class BotConfig: pass
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cleangram_codegen.enums import AdjustType, ModelType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+
+MESSAGE = {"message_id": 1, "chat": {"id": 1, "type": "private"}, "text": "hi"}
+
+
+@pytest.fixture(params=[ModelType.PYDANTIC, ModelType.SLOTS], ids=lambda m: m.value)
+def aio(request, render, base):
+    with mount(render(adjust=AdjustType.CONTEXT, model=request.param), base) as finder:
+        yield SimpleNamespace(
+            objects=finder.import_module("cleangram.aio.objects"),
+            bot=finder.import_module("cleangram.aio.bot.bot"),
+        )
+
+
+def make_bot(aio):
+    async def receive(bot, path, http_timeout):
+        return aio.objects.Message.parse_obj(MESSAGE)
+
+    class Bot(aio.bot.Bot):
+        token = me = id = http = None
+        config = SimpleNamespace(http=receive)
+
+    return Bot()
+
+
+def test_received_objects_keep_their_bot(aio):
+    first, second = make_bot(aio), make_bot(aio)
+
+    async def handle():
+        message = await first(None)
+        await second(None)
+        return message
+
+    message = asyncio.run(handle())
+    assert message.bot is first
+    assert aio.bot.Bot.current() is None
+
+
+def test_objects_are_bound_inside_of_block(aio):
+    bot = make_bot(aio)
+    with bot.bound():
+        message = aio.objects.Message.parse_obj(MESSAGE)
+    assert message.bot is bot
+    assert message.copy().bot is bot
+
+
+def test_adjust_binds_objects_built_outside(aio):
+    message = aio.objects.Message.parse_obj(MESSAGE)
+    with pytest.raises(RuntimeError, match="Message is not bound to a bot"):
+        message.bot
+    bot = make_bot(aio)
+    message.adjust(bot)
+    assert message.bot is bot
@@ -0,0 +1,15 @@
+import sys
+
+import pytest
+
+from cleangram_codegen.bench import bench_imports
+
+pytest.importorskip("pydantic")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_bundled_layout_loads_fewer_modules(api, base):
+    results = {r["layout"]: r for r in bench_imports(api, base, ["cleangram.aio.paths"], 1)}
+    assert set(results) == {"split", "split lazy", "bundled"}
+    assert results["bundled"]["modules"] < results["split"]["modules"]
+    assert all(r["seconds"] > 0 and r["rss"] >= 0 for r in results.values())
@@ -0,0 +1,25 @@
+import json
+
+from cleangram_codegen import cache
+from cleangram_codegen.enums import BackendType
+from cleangram_codegen.parser import get_api, resolve
+
+
+def test_corrupt_entry_is_parsed_again(base, tmp_path):
+    spec = base / "api.html"
+    fresh = cache.dump(get_api(spec, cache_dir=tmp_path))
+    entry, = tmp_path.glob("*.json")
+    entry.write_bytes(entry.read_bytes()[:100])
+    assert cache.dump(get_api(spec, cache_dir=tmp_path)) == fresh
+    with open(entry, encoding="utf-8") as f:
+        assert cache.dump(cache.loads(json.load(f))) == fresh
+
+
+def test_foreign_entry_is_removed(base, tmp_path):
+    spec = base / "api.html"
+    get_api(spec, cache_dir=tmp_path)
+    entry, = tmp_path.glob("*.json")
+    entry.write_text('{"version": "6.0"}', encoding="utf-8")
+    html = spec.read_text(encoding="utf-8")
+    assert cache.load(html, tmp_path, resolve(BackendType.AUTO)) is None
+    assert not entry.exists()
@@ -0,0 +1,32 @@
+import pytest
+
+from cleangram_codegen.enums import ModelType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+
+
+@pytest.fixture(params=[ModelType.PYDANTIC, ModelType.SLOTS], ids=lambda m: m.value)
+def objects(request, render, base):
+    with mount(render(model=request.param), base) as finder:
+        objects = finder.import_module("cleangram.aio.objects")
+        finder.import_module("cleangram.aio.objects.decoders")
+        yield objects
+
+
+def test_parent_decodes_variant_by_discriminator(objects):
+    media = objects.decoders.input_media_from_dict('{"type": "video", "media": "file"}')
+    assert isinstance(media, objects.InputMediaVideo)
+    assert media.media == "file"
+    with pytest.raises(ValueError, match="unknown InputMedia type 'audio'"):
+        objects.decoders.input_media_from_dict({"type": "audio", "media": "file"})
+
+
+def test_union_decodes_member_by_required_keys(objects):
+    decoders = (
+        (("message_id", "chat"), objects.decoders.message_from_dict),
+        (("id", "type"), objects.decoders.chat_from_dict),
+    )
+    chat = objects.decoders._union({"id": 1, "type": "private"}, decoders)
+    assert isinstance(chat, objects.Chat)
+    assert objects.decoders._union("file", decoders) == "file"
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from cleangram_codegen.bench import DiscardHandler, http_stub
+from cleangram_codegen.enums import EncodeType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+httpx = pytest.importorskip("httpx")
+
+PRESET = SimpleNamespace(parse_mode=lambda mode: mode)
+MESSAGE = {"message_id": 1, "chat": {"id": 1, "type": "private"}, "text": "hi"}
+ADJUSTED = []
+
+
+class MessageHandler(DiscardHandler):
+    reply = json.dumps({"ok": True, "result": MESSAGE}).encode()
+    sent = []
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.sent.append((self.path, json.loads(self.rfile.read(length))))
+        self.answer()
+
+
+class FailedHandler(DiscardHandler):
+    reply = json.dumps({"ok": False, "description": "Bad Request"}).encode()
+    status = 400
+
+
+class GatewayHandler(DiscardHandler):
+    reply = b"<html>Bad Gateway</html>"
+    status = 502
+    content_type = "text/html"
+
+
+@pytest.fixture
+def package(render, base, monkeypatch):
+    with mount(render(encode=EncodeType.DIRECT), base) as finder:
+        bot = finder.import_module("cleangram.aio.bot.bot")
+        monkeypatch.setattr(bot.Message, "adjust", lambda self, by: ADJUSTED.append((self, by)))
+        yield SimpleNamespace(bot=bot, http=finder.import_module("cleangram.aio.http"))
+
+
+def send_message(package, handler, transport=None):
+    async def main(server, transport):
+        own = transport is None
+        if own:
+            transport = package.http.HttpX("http://%s:%d" % server)
+
+        class Bot(package.bot.Bot):
+            token = "42:token"
+            me = id = http = None
+            config = SimpleNamespace(http=transport, preset=PRESET)
+
+        sender = Bot()
+        try:
+            return sender, await sender.send_message(chat_id=1, text="hi")
+        finally:
+            if own:
+                await transport.close()
+
+    with http_stub(handler) as server:
+        return asyncio.run(main(server, transport))
+
+
+def test_payload_is_posted_and_response_parsed(package):
+    MessageHandler.sent.clear()
+    sender, message = send_message(package, MessageHandler)
+    assert MessageHandler.sent == [("/bot42:token/sendMessage", {"chat_id": 1, "text": "hi"})]
+    assert message.text == "hi"
+    assert ADJUSTED.pop() == (message, sender)
+
+
+def test_failed_response_raises(package):
+    with pytest.raises(RuntimeError, match="SendMessage failed"):
+        send_message(package, FailedHandler)
+
+
+def test_error_status_without_json_raises(package):
+    with pytest.raises(httpx.HTTPStatusError):
+        send_message(package, GatewayHandler)
+
+
+def test_http_without_post_is_reported(package):
+    with pytest.raises(NotImplementedError, match="has no post"):
+        send_message(package, DiscardHandler, SimpleNamespace())
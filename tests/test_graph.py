@@ -0,0 +1,34 @@
+def baseline_adjusted(api):
+    adjusted = set()
+
+    def is_adjusted(c):
+        if c in api.aliased_objects or c in adjusted:
+            adjusted.add(c)
+            return True
+        for o in c.used_objects:
+            if is_adjusted(o):
+                adjusted.add(c)
+
+    for c in api.all_results_objects:
+        is_adjusted(c)
+    return adjusted
+
+
+def test_adjusted_matches_baseline(api):
+    assert api.adjusted_objects == baseline_adjusted(api)
+    assert {str(o) for o in api.adjusted_objects} == {"CallbackQuery", "Chat", "Message", "Update"}
+
+
+def test_edges(api):
+    message = api.by_name["Message"]
+    chat = api.by_name["Chat"]
+    assert chat in api.graph.dependencies(message)
+    assert message in api.graph.dependents(chat)
+    assert api.by_name["sendMessage"] in api.graph.dependents(message)
+
+
+def test_topo_order(api):
+    order = api.graph.topo_order()
+    assert sorted(order, key=str) == sorted(api.graph.nodes, key=str)
+    position = {c: i for i, c in enumerate(order)}
+    assert position[api.by_name["User"]] < position[api.by_name["sendMessage"]]
@@ -0,0 +1,55 @@
+import sys
+
+import pytest
+
+from cleangram_codegen.bench import import_profile, install
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+
+
+def loaded(finder, name: str) -> bool:
+    return f"{finder.prefix}.{name}" in sys.modules
+
+
+def test_components_are_imported_on_first_access(render, base):
+    with mount(render(lazy_init=True), base) as finder:
+        objects = finder.import_module("cleangram.core.objects")
+        assert "Message" in objects.__all__
+        assert not loaded(finder, "cleangram.core.objects.message")
+        assert not loaded(finder, "cleangram.core.objects.photo_size")
+
+        assert objects.PhotoSize.__name__ == "PhotoSize"
+        assert loaded(finder, "cleangram.core.objects.photo_size")
+        assert not loaded(finder, "cleangram.core.objects.message")
+
+        assert objects.Message.__name__ == "Message"
+        assert loaded(finder, "cleangram.core.objects.message")
+
+
+def test_package_of_adjusted_components_is_lazy(render, base):
+    with mount(render(lazy_init=True), base) as finder:
+        objects = finder.import_module("cleangram.aio.objects")
+        assert not loaded(finder, "cleangram.aio.objects.message")
+        assert not loaded(finder, "cleangram.core.objects.message")
+
+        message = objects.Message
+        assert loaded(finder, "cleangram.aio.objects.message")
+        assert message.__mro__[1].__module__ == f"{finder.prefix}.cleangram.core.objects.message"
+
+
+def test_eager_package_imports_every_component(render, base):
+    with mount(render(), base) as finder:
+        finder.import_module("cleangram.core.objects")
+        assert loaded(finder, "cleangram.core.objects.message")
+        assert loaded(finder, "cleangram.core.objects.photo_size")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_lazy_package_is_imported_faster(render, base, tmp_path):
+    profiles = {}
+    for lazy in (False, True):
+        install(render(lazy_init=lazy), base, tmp_path / str(lazy))
+        profiles[lazy] = import_profile(tmp_path / str(lazy), "cleangram.core.objects")
+    assert profiles[True]["modules"] < profiles[False]["modules"]
+    assert profiles[True]["us"] < profiles[False]["us"]
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cleangram_codegen.bench import DiscardHandler, http_stub
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+PRESET = SimpleNamespace(parse_mode=lambda mode: mode)
+
+
+class ChatHandler(DiscardHandler):
+    """
+    Answers messages after a delay, counting requests in flight, fails every fifth chat
+    """
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def do_POST(self):
+        chat_id = int(json.loads(self.rfile.read(int(self.headers["Content-Length"])))["chat_id"])
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(0.01 * (chat_id % 3))
+        with cls.lock:
+            cls.in_flight -= 1
+        if chat_id % 5 == 0:
+            self.reply = json.dumps({"ok": False}).encode()
+        else:
+            message = {"message_id": chat_id, "chat": {"id": chat_id, "type": "private"}}
+            self.reply = json.dumps({"ok": True, "result": message}).encode()
+        self.answer()
+
+
+@pytest.fixture
+def package(render, base):
+    with mount(render(shared_pool=True), base) as finder:
+        yield SimpleNamespace(
+            bot=finder.import_module("cleangram.aio.bot.bot"),
+            http=finder.import_module("cleangram.aio.http"),
+            paths=finder.import_module("cleangram.aio.paths"),
+        )
+
+
+def make_bot(package, server=("127.0.0.1", 0)):
+    transport = package.http.HttpX("http://%s:%d" % server)
+
+    class Bot(package.bot.Bot):
+        token = "42:token"
+        me = id = None
+        http = transport
+        config = SimpleNamespace(http=transport, preset=PRESET)
+
+    return Bot()
+
+
+def test_map_is_emitted_with_shared_pool(render):
+    assert "def map(" not in render().files["cleangram/aio/bot/bot.py"]
+
+
+def test_results_keep_order_with_failures_in_place(package):
+    paths = (package.paths.SendMessage(chat_id=n, text="hi") for n in range(1, 21))
+
+    async def main(server):
+        bot = make_bot(package, server)
+        try:
+            return await bot.map(paths, concurrency=4)
+        finally:
+            await bot.cleanup()
+
+    with http_stub(ChatHandler) as server:
+        results = asyncio.run(main(server))
+    assert len(results) == 20
+    for n, result in enumerate(results, 1):
+        if n % 5 == 0:
+            assert isinstance(result, RuntimeError)
+        else:
+            assert result.chat.id == n
+    assert ChatHandler.peak == 4
+    assert package.bot.ClientPool.users == 0
+
+
+def test_concurrency_must_be_positive(package):
+    with pytest.raises(ValueError, match="concurrency must be at least 1"):
+        asyncio.run(make_bot(package).map([], concurrency=0))
@@ -0,0 +1,14 @@
+def test_indexes(api):
+    message = api.by_name["Message"]
+    assert api.by_anchor["#message"] is message
+    assert api.by_anchor["#sendmessage"] is api.by_name["sendMessage"]
+    assert api.by_name["sendMessage"] in api.used_by[message]
+    assert api.used_by[api.by_name["InputMedia"]] == (api.by_name["sendMediaGroup"],)
+    assert message.aliased_paths == api.aliased_by[message] == (api.by_name["sendMessage"],)
+
+
+def test_input_media_takes_files(api):
+    media, = api.by_name["sendMediaGroup"].args[1:]
+    assert media.com_types == [api.by_name["InputMedia"]]
+    for sub in api.by_name["InputMedia"].subclasses:
+        assert api.input_file in next(a for a in sub.args if a.name == "media").com_types
@@ -0,0 +1,23 @@
+import pytest
+
+from cleangram_codegen import parser
+from cleangram_codegen.bench import dump
+from cleangram_codegen.enums import BackendType
+
+
+@pytest.fixture(scope="module")
+def html(base) -> str:
+    return (base / "api.html").read_text(encoding="utf-8")
+
+
+def test_auto_prefers_lxml():
+    expected = BackendType.LXML if parser.HAS_LXML else BackendType.HTML_PARSER
+    assert parser.resolve(BackendType.AUTO) == expected
+    assert parser.resolve(BackendType.STREAM) == BackendType.STREAM
+
+
+@pytest.mark.parametrize("backend", list(BackendType), ids=lambda b: b.value)
+def test_backends_build_identical_api(html, backend):
+    if backend == BackendType.LXML and not parser.HAS_LXML:
+        pytest.skip("lxml is not installed")
+    assert dump(html, backend) == dump(html, BackendType.HTML_PARSER)
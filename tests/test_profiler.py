@@ -0,0 +1,30 @@
+from cleangram_codegen.generator import Generator
+from cleangram_codegen.profiler import Profiler
+from cleangram_codegen.sinks import MemorySink
+from cleangram_codegen.templates import ObjectTemplate
+
+HELD = 2 ** 20
+
+
+def test_render_record_covers_building_of_template(api, monkeypatch):
+    post_init = ObjectTemplate.__post_init__
+
+    def building(self):
+        held = bytearray(HELD)
+        post_init(self)
+        del held
+
+    monkeypatch.setattr(ObjectTemplate, "__post_init__", building)
+    with Profiler() as profiler:
+        Generator(
+            cache_dir=None, jobs=1, incremental=False, sink=MemorySink(), api=api,
+            profiler=profiler,
+        ).run()
+
+    records = [
+        r for r in profiler.records
+        if r.phase == "render" and r.template == ObjectTemplate.__name__
+    ]
+    assert records
+    assert {r.component for r in records} >= {"Message", "Update"}
+    assert all(r.peak >= HELD for r in records)
@@ -0,0 +1,143 @@
+import asyncio
+import io
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from cleangram_codegen.bench import DiscardHandler, http_stub
+from cleangram_codegen.enums import EncodeType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+pytest.importorskip("httpx")
+
+PRESET = SimpleNamespace(parse_mode=lambda mode: mode)
+MESSAGE = {"message_id": 1, "chat": {"id": 1, "type": "private"}, "text": "hi"}
+
+
+class MessageHandler(DiscardHandler):
+    reply = json.dumps({"ok": True, "result": MESSAGE}).encode()
+    paths = []
+
+    def do_POST(self):
+        self.paths.append(self.path)
+        super(MessageHandler, self).do_POST()
+
+
+def load(finder):
+    return SimpleNamespace(
+        aio=finder.import_module("cleangram.aio.bot.bot"),
+        sync=finder.import_module("cleangram.sync.bot.bot"),
+        aio_http=finder.import_module("cleangram.aio.http"),
+        sync_http=finder.import_module("cleangram.sync.http"),
+        multipart=finder.import_module("cleangram.core.paths.multipart"),
+    )
+
+
+@pytest.fixture
+def package(render, base):
+    with mount(render(shared_pool=True, encode=EncodeType.DIRECT), base) as finder:
+        yield load(finder)
+
+
+@pytest.fixture
+def models(render, base):
+    with mount(render(shared_pool=True), base) as finder:
+        yield load(finder)
+
+
+def make_bot(bot, transport):
+    class Bot(bot.Bot):
+        token = "42:token"
+        me = id = None
+        http = transport
+        config = SimpleNamespace(http=transport, preset=PRESET)
+
+    return Bot()
+
+
+def url(server):
+    return "http://%s:%d" % server
+
+
+def test_pool_does_not_imply_direct_encoding(render):
+    files = render(shared_pool=True).files
+    assert "cleangram/core/paths/encoders.py" not in files
+    assert "def post(" not in files["cleangram/aio/bot/bot.py"]
+    assert "asyncio.Lock()" in files["cleangram/aio/bot/bot.py"]
+
+
+def test_bot_acquires_pool_once_across_threads(package):
+    pool = package.sync.ClientPool
+    bot = make_bot(package.sync, package.sync_http.HttpX())
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def first_use():
+        barrier.wait()
+        clients.append(bot.connect())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.users == 1
+    assert all(client is pool.client for client in clients)
+    bot.cleanup()
+    bot.cleanup()
+    assert pool.users == 0
+    assert pool.client is None
+
+
+def test_sync_bot_sends_through_pool(package):
+    pool = package.sync.ClientPool
+    MessageHandler.paths.clear()
+    with http_stub(MessageHandler) as server:
+        bot = make_bot(package.sync, package.sync_http.HttpX(url(server)))
+        message = bot.send_message(chat_id=1, text="hi")
+        bot.send_photo(chat_id=1, photo=package.multipart.FilePart(io.BytesIO(b"photo")))
+        assert pool.users == 1
+        assert bot.http.client is None
+        bot.cleanup()
+    assert message.text == "hi"
+    assert MessageHandler.paths == ["/bot42:token/sendMessage", "/bot42:token/sendPhoto"]
+    assert pool.users == 0
+
+
+def test_path_models_are_sent_through_pool(models):
+    pool = models.sync.ClientPool
+    MessageHandler.paths.clear()
+    with http_stub(MessageHandler) as server:
+        bot = make_bot(models.sync, models.sync_http.HttpX(url(server)))
+        message = bot.send_message(chat_id=1, text="hi")
+        assert pool.users == 1
+        assert bot.http.client is None
+        bot.cleanup()
+    assert message.text == "hi"
+    assert MessageHandler.paths == ["/bot42:token/sendMessage"]
+
+
+def test_aio_bots_share_client(package):
+    pool = package.aio.ClientPool
+    MessageHandler.paths.clear()
+
+    async def main(server):
+        first = make_bot(package.aio, package.aio_http.HttpX(url(server)))
+        second = make_bot(package.aio, package.aio_http.HttpX(url(server)))
+        await asyncio.gather(
+            first.send_message(chat_id=1, text="hi"),
+            second.send_photo(chat_id=1, photo=package.multipart.FilePart(io.BytesIO(b"photo"))),
+        )
+        assert await first.connect() is await second.connect()
+        assert pool.users == 2
+        await first.cleanup()
+        assert pool.client is not None
+        await second.cleanup()
+
+    with http_stub(MessageHandler) as server:
+        asyncio.run(main(server))
+    assert sorted(MessageHandler.paths) == ["/bot42:token/sendMessage", "/bot42:token/sendPhoto"]
+    assert pool.users == 0 and pool.client is None
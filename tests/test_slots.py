@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from cleangram_codegen.enums import ModelType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+
+MESSAGE = {"message_id": 1, "chat": {"id": 1, "type": "private"}, "text": "hi", "entities": []}
+
+
+@pytest.fixture
+def finder(render, base):
+    with mount(render(model=ModelType.SLOTS), base) as finder:
+        yield finder
+
+
+@pytest.fixture
+def objects(finder):
+    return finder.import_module("cleangram.aio.objects")
+
+
+def test_parent_dispatches_on_discriminator(objects):
+    media = objects.InputMedia.parse_obj({"type": "video", "media": "file", "parse_mode": "HTML"})
+    assert isinstance(media, objects.InputMediaVideo)
+    assert media.parse_mode == "HTML"
+    photo = objects.InputMediaPhoto.parse_obj({"media": "file"})
+    assert isinstance(photo, objects.InputMediaPhoto)
+
+
+def test_union_member_chosen_by_required_keys(finder, objects):
+    decode = finder.import_module("cleangram.core.objects.slots")._decode
+    chat = decode(MESSAGE["chat"], (objects.Message, objects.Chat), 0)
+    assert isinstance(chat, objects.Chat)
+    messages = decode([[MESSAGE]], (objects.Message, objects.Chat), 2)
+    assert isinstance(messages[0][0], objects.Message)
+
+
+def test_dict_and_json_accept_pydantic_options(objects):
+    message = objects.Message.parse_obj(MESSAGE)
+    assert json.loads(message.json(exclude_unset=True)) == {
+        "message_id": 1, "chat": {"id": 1, "type": "private"}, "text": "hi",
+    }
+    assert message.dict(include={"message_id"}) == {"message_id": 1}
+    assert "from" in message.dict(by_alias=True, exclude={"chat"})
+    assert message.json(exclude_none=True, sort_keys=True).startswith('{"chat"')
+
+
+def test_paths_encode_nested_objects(finder, objects):
+    from pydantic.json import ENCODERS_BY_TYPE
+
+    paths = finder.import_module("cleangram.core.paths")
+    path = paths.SendMediaGroup(chat_id=1, media=[objects.InputMediaPhoto(media="file_id")])
+    assert json.loads(path.json())["media"] == [{"type": "photo", "media": "file_id"}]
+    assert not any(cls.__name__ == "TelegramObject" for cls in ENCODERS_BY_TYPE)
+
+
+def test_file_part_keeps_reader_in_slot(finder):
+    part = finder.import_module("cleangram.core.paths.multipart").FilePart(io.BytesIO(b"abc"))
+    assert "_reader" in type(part).__slots__
+    assert (part.size, part.read()) == (3, b"abc")
@@ -0,0 +1,21 @@
+from cleangram_codegen.enums import PackageType
+from cleangram_codegen.templates import ObjectTemplate, PathTemplate
+
+
+def test_bundled_module_holds_components_of_its_category(api):
+    send_message = api.by_name["sendMessage"]
+    tmp = PathTemplate(api=api, package=PackageType.CORE, com=send_message, bundled=True)
+    assert tmp.is_bundled(api.by_name["getMe"])
+    assert not tmp.is_bundled(api.by_name["Message"])
+
+    tmp = ObjectTemplate(api=api, package=PackageType.CORE, com=api.by_name["Chat"], bundled=True)
+    assert tmp.is_bundled(api.by_name["Message"])
+    assert not tmp.is_bundled(send_message)
+
+
+def test_objects_are_imported_across_categories(api):
+    tmp = PathTemplate(
+        api=api, package=PackageType.CORE, com=api.by_name["sendMessage"], bundled=True,
+    )
+    tmp.write_import(api.by_name["Message"])
+    assert "from ..objects import Message" in tmp.sections["import"]
@@ -0,0 +1,125 @@
+import asyncio
+import http.client
+import io
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from cleangram_codegen.bench import DiscardHandler, http_stub, peak_rss
+from cleangram_codegen.enums import EncodeType
+from cleangram_codegen.importer import mount
+
+pytest.importorskip("pydantic")
+
+PRESET = SimpleNamespace(parse_mode=lambda mode: mode)
+MESSAGE = {"message_id": 1, "chat": {"id": 1, "type": "private"}}
+MiB = 2 ** 20
+
+
+class MessageHandler(DiscardHandler):
+    reply = json.dumps({"ok": True, "result": MESSAGE}).encode()
+
+
+@pytest.fixture
+def package(render, base):
+    with mount(render(encode=EncodeType.DIRECT), base) as finder:
+        yield SimpleNamespace(
+            bot=finder.import_module("cleangram.sync.bot.bot"),
+            objects=finder.import_module("cleangram.sync.objects"),
+            multipart=finder.import_module("cleangram.core.paths.multipart"),
+        )
+
+
+class Http:
+    """
+    Posts payloads to local HTTP server, uploads as streamed multipart bodies
+    """
+
+    def __init__(self, address, multipart):
+        self.address = address
+        self.multipart = multipart
+        self.bodies = []
+
+    def post(self, bot, path, payload, timeout):
+        conn = http.client.HTTPConnection(*self.address, timeout=timeout)
+        if isinstance(payload, self.multipart.Multipart):
+            body, headers = payload, payload.headers
+        else:
+            body, headers = json.dumps(payload), {"Content-Type": "application/json"}
+        self.bodies.append(body)
+        conn.request("POST", f"/{path.__name__}", body=body, headers=headers)
+        try:
+            return conn.getresponse().read()
+        finally:
+            conn.close()
+
+
+def make_bot(package, transport):
+    class Bot(package.bot.Bot):
+        token = me = id = http = None
+        config = SimpleNamespace(http=transport, preset=PRESET)
+
+    return Bot()
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/statm"), reason="resident memory is read from procfs",
+)
+def test_upload_streams_file_with_bounded_memory(package, tmp_path):
+    path = tmp_path / "photo.jpg"
+    with open(path, "wb") as f:
+        for _ in range(32):
+            f.write(os.urandom(MiB))
+    with http_stub(MessageHandler) as address:
+        transport = Http(address, package.multipart)
+        bot = make_bot(package, transport)
+        with peak_rss() as memory:
+            message = bot.send_photo(chat_id=1, photo=package.multipart.FilePart(path))
+    assert isinstance(message, package.objects.Message)
+    body, = transport.bodies
+    assert isinstance(body, package.multipart.Multipart)
+    assert body.length > 32 * MiB
+    assert memory["peak"] < 8 * MiB
+
+
+def test_media_files_are_attached(package):
+    parts = [package.multipart.FilePart(io.BytesIO(data)) for data in (b"photo", b"video")]
+    media = [
+        package.objects.InputMediaPhoto(media=parts[0]),
+        package.objects.InputMediaVideo(media="file_id", thumb=parts[1]),
+    ]
+    encoders = package.bot.send_media_group_to_dict.__globals__
+    payload = encoders["send_media_group_to_dict"](chat_id=1, media=media)
+    body = package.multipart.Multipart.from_payload(payload)
+    assert [m.get("media") for m in payload["media"]] == ["attach://file0", "file_id"]
+    assert payload["media"][1]["thumb"] == "attach://file1"
+    assert [part for _, part in body.files] == parts
+    with pytest.raises(TypeError, match="upload files as FilePart"):
+        package.multipart.Multipart.from_payload({"photo": package.objects.InputFile()})
+
+
+def test_file_objects_without_descriptor(package):
+    class Pipe(io.RawIOBase):
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            return 0
+
+    assert package.multipart.FilePart(io.BytesIO(b"abc")).size == 3
+    body = package.multipart.Multipart({}, {"file": package.multipart.FilePart(Pipe())})
+    assert body.length is None
+    assert "Content-Length" not in body.headers
+
+
+def test_body_streams_inside_of_running_loop(package):
+    part = package.multipart.FilePart(io.BytesIO(b"x" * 10))
+    body = package.multipart.Multipart({"chat_id": 1}, {"photo": part})
+
+    async def read():
+        return b"".join([chunk async for chunk in body])
+
+    assert asyncio.run(read()) == b"".join(body)
+    assert len(b"".join(body)) == body.length